@@ -0,0 +1,228 @@
+import os
+import csv
+import json
+import math
+import argparse
+
+import numpy as np
+
+from gunpack_parser import GunpackParser
+
+# Weapon balance analytics over every gun in a pack at once. Gun data is read
+# once into flat NumPy arrays (one row per gun); each scenario (target health,
+# armor, distance) is then a handful of array operations over all rows.
+#
+# Two data layouts are understood:
+#   * the generator template: "rpm" and "damage": {"head", "body", "limb"}
+#   * TACZ gun data: "rpm" and "bullet": {"damage", "bullet_amount",
+#     "extra_damage": {"head_shot_multiplier", "armor_ignore",
+#     "damage_adjust": [{"distance", "damage"}, ...]}}
+# damage_adjust is a step function: a hit at distance d uses the first entry
+# whose distance is >= d ("infinite" closes the table).
+
+HITBOXES = ("head", "body", "limb")
+DEFAULT_HEAD_MULTIPLIER = 2.0
+
+
+class WeaponStatsTable:
+    """Column arrays for every gun in a pack, rows ordered like self.ids."""
+
+    def __init__(self, ids, rpm, base_damage, pellets, armor_ignore, falloff_distance, falloff_damage):
+        self.ids = ids
+        self.rpm = rpm                          # (n,)
+        self.base_damage = base_damage          # (n, 3) per-pellet damage for HITBOXES at point blank
+        self.pellets = pellets                  # (n,)
+        self.armor_ignore = armor_ignore        # (n,) fraction of damage that bypasses armor
+        self.falloff_distance = falloff_distance  # (n, k) ascending, padded with inf
+        self.falloff_damage = falloff_damage    # (n, k) body damage per step, padded with the last step
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def _read_gun_fields(data):
+    """Extracts (rpm, (head, body, limb), pellets, armor_ignore, falloff) from one gun's data JSON."""
+    rpm = float(data.get("rpm", 0) or 0)
+    bullet = data.get("bullet") if isinstance(data.get("bullet"), dict) else {}
+    extra = bullet.get("extra_damage") if isinstance(bullet.get("extra_damage"), dict) else {}
+    if isinstance(data.get("damage"), dict):
+        dmg = data["damage"]
+        body = float(dmg.get("body", 0))
+        hitbox = (float(dmg.get("head", body)), body, float(dmg.get("limb", body)))
+    else:
+        body = float(bullet.get("damage", data.get("damage", 0)) or 0)
+        head_mult = float(extra.get("head_shot_multiplier", DEFAULT_HEAD_MULTIPLIER))
+        hitbox = (body * head_mult, body, body)
+    pellets = max(1, int(bullet.get("bullet_amount", data.get("pellets", 1)) or 1))
+    armor_ignore = min(1.0, max(0.0, float(extra.get("armor_ignore", data.get("armor_ignore", 0)) or 0)))
+    falloff = []
+    for step in extra.get("damage_adjust", data.get("damage_falloff", [])) or []:
+        distance = step.get("distance")
+        distance = math.inf if distance in (None, "infinite") else float(distance)
+        falloff.append((distance, float(step.get("damage", body))))
+    falloff.sort()
+    return rpm, hitbox, pellets, armor_ignore, falloff
+
+
+def load_weapon_stats(parser):
+    """Reads the data JSON of every gun in a parsed pack into a WeaponStatsTable."""
+    ids, rows = [], []
+    data_dir = os.path.join(parser.gunpack_root_dir, f"data/{parser.namespace}/data/guns")
+    for item_id in sorted(parser.weapons_data):
+        data_path = os.path.join(data_dir, f"{item_id}.json")
+        if not os.path.isfile(data_path):
+            continue
+        try:
+            with open(data_path, 'r', encoding='utf-8') as f:
+                rows.append(_read_gun_fields(json.load(f)))
+            ids.append(item_id)
+        except Exception as e:
+            print(f"Warning: Skipping weapon '{item_id}', could not read {data_path}: {e}")
+    return build_stats_table(ids, rows)
+
+
+def build_stats_table(ids, rows):
+    """Packs rows from _read_gun_fields into column arrays."""
+    n = len(rows)
+    width = max([len(r[4]) for r in rows] + [0]) + 1
+    falloff_distance = np.full((n, width), np.inf)
+    falloff_damage = np.empty((n, width))
+    for i, (_, hitbox, _, _, falloff) in enumerate(rows):
+        steps = falloff or [(math.inf, hitbox[1])]
+        falloff_distance[i, :len(steps)] = [d for d, _ in steps]
+        falloff_damage[i, :len(steps)] = [v for _, v in steps]
+        falloff_damage[i, len(steps):] = steps[-1][1]
+    return WeaponStatsTable(
+        ids=list(ids),
+        rpm=np.array([r[0] for r in rows], dtype=float),
+        base_damage=np.array([r[1] for r in rows], dtype=float).reshape(n, len(HITBOXES)),
+        pellets=np.array([r[2] for r in rows], dtype=float),
+        armor_ignore=np.array([r[3] for r in rows], dtype=float),
+        falloff_distance=falloff_distance,
+        falloff_damage=falloff_damage,
+    )
+
+
+def damage_at_distance(table, distances):
+    """Per-pellet damage for every gun, hitbox and distance: shape (n, len(distances), 3)."""
+    distances = np.atleast_1d(np.asarray(distances, dtype=float))
+    steps = (table.falloff_distance[:, None, :] < distances[None, :, None]).sum(axis=2)
+    steps = np.minimum(steps, table.falloff_distance.shape[1] - 1)
+    body = np.take_along_axis(table.falloff_damage, steps, axis=1)
+    base_body = table.base_damage[:, 1:2]
+    ratio = np.divide(body, base_body, out=np.ones_like(body), where=base_body != 0)
+    return table.base_damage[:, None, :] * ratio[:, :, None]
+
+
+def apply_armor(damage, armor, toughness, armor_ignore):
+    """Minecraft armor reduction, with armor_ignore of each hit bypassing it."""
+    reduction = np.clip(np.maximum(armor / 5.0, armor - damage / (2.0 + toughness / 4.0)), 0.0, 20.0) / 25.0
+    ignore = armor_ignore.reshape(armor_ignore.shape + (1,) * (damage.ndim - 1))
+    return damage * ignore + damage * (1.0 - reduction) * (1.0 - ignore)
+
+
+def evaluate_scenario(table, health=20.0, armor=0.0, toughness=0.0, distance=0.0):
+    """DPS, shots-to-kill and time-to-kill for every gun and hitbox in one scenario."""
+    per_pellet = damage_at_distance(table, distance)[:, 0, :]
+    per_pellet = apply_armor(per_pellet, armor, toughness, table.armor_ignore)
+    per_shot = per_pellet * table.pellets[:, None]
+    shots_per_second = table.rpm[:, None] / 60.0
+    dps = per_shot * shots_per_second
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shots = np.where(per_shot > 0, np.ceil(health / per_shot), np.inf)
+        ttk = np.where(shots_per_second > 0, (shots - 1) / shots_per_second, np.inf)
+    return {"damage_per_shot": per_shot, "dps": dps, "shots_to_kill": shots, "ttk": ttk}
+
+
+def find_outliers(values, threshold=3.5):
+    """Robust z-score (median/MAD, or mean absolute deviation when MAD is 0) outlier mask; infinite values are always outliers."""
+    values = np.asarray(values, dtype=float)
+    finite = np.isfinite(values)
+    mask = ~finite
+    if finite.sum() < 3:
+        return mask
+    median = np.median(values[finite])
+    deviation = np.abs(values[finite] - median)
+    scale = 1.4826 * np.median(deviation)
+    if scale == 0:
+        # Over half the values tie (cloned guns, stepped TTKs); use the mean absolute deviation instead.
+        scale = 1.253314 * deviation.mean()
+        if scale == 0:
+            return mask
+    mask[finite] = deviation / scale > threshold
+    return mask
+
+
+def build_report(table, scenario, results, curve_distances=None, threshold=3.5):
+    """One row per gun with scenario results and outlier flags; range curves optional."""
+    body = HITBOXES.index("body")
+    dps_outliers = find_outliers(results["dps"][:, body], threshold)
+    ttk_outliers = find_outliers(results["ttk"][:, body], threshold)
+    curves = damage_at_distance(table, curve_distances)[:, :, body] * table.pellets[:, None] \
+        if curve_distances is not None else None
+    rows = []
+    for i, item_id in enumerate(table.ids):
+        row = {"id": item_id, "rpm": float(table.rpm[i]), "pellets": int(table.pellets[i])}
+        for h, hitbox in enumerate(HITBOXES):
+            row[f"damage_{hitbox}"] = round(float(results["damage_per_shot"][i, h]), 3)
+            row[f"dps_{hitbox}"] = round(float(results["dps"][i, h]), 3)
+            row[f"shots_{hitbox}"] = float(results["shots_to_kill"][i, h])
+            row[f"ttk_{hitbox}"] = round(float(results["ttk"][i, h]), 4)
+        row["dps_outlier"] = bool(dps_outliers[i])
+        row["ttk_outlier"] = bool(ttk_outliers[i])
+        if curves is not None:
+            row["range_curve"] = [round(float(v), 3) for v in curves[i]]
+        rows.append(row)
+    return {"scenario": scenario, "curve_distances": list(curve_distances) if curve_distances is not None else None,
+            "weapons": rows}
+
+
+def write_report_csv(report, csv_path):
+    rows = report["weapons"]
+    fieldnames = [k for k in (rows[0].keys() if rows else ["id"]) if k != "range_curve"]
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_report_json(report, json_path):
+    # Infinite TTK (zero damage or rpm) is written as null rather than the non-standard Infinity.
+    def _clean(value):
+        if isinstance(value, float) and not math.isfinite(value): return None
+        if isinstance(value, dict): return {k: _clean(v) for k, v in value.items()}
+        if isinstance(value, list): return [_clean(v) for v in value]
+        return value
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(_clean(report), f, indent=4, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Compare DPS/TTK/falloff across all guns in a TACZ gunpack.")
+    arg_parser.add_argument("pack", help="Gunpack folder or .zip")
+    arg_parser.add_argument("--health", type=float, default=20.0)
+    arg_parser.add_argument("--armor", type=float, default=0.0)
+    arg_parser.add_argument("--toughness", type=float, default=0.0)
+    arg_parser.add_argument("--distance", type=float, default=0.0, help="Engagement distance in blocks.")
+    arg_parser.add_argument("--curve", type=float, nargs="*", default=[0, 10, 20, 30, 50, 75, 100, 150],
+                            help="Distances sampled for range curves.")
+    arg_parser.add_argument("--outlier-threshold", type=float, default=3.5)
+    arg_parser.add_argument("--csv", help="Write the report as CSV.")
+    arg_parser.add_argument("--json", help="Write the report (with range curves) as JSON.")
+    args = arg_parser.parse_args()
+
+    parser = GunpackParser(args.pack)
+    try:
+        table = load_weapon_stats(parser)
+    finally:
+        parser.cleanup()
+    scenario = {"health": args.health, "armor": args.armor, "toughness": args.toughness, "distance": args.distance}
+    results = evaluate_scenario(table, **scenario)
+    report = build_report(table, scenario, results, args.curve, args.outlier_threshold)
+
+    if args.csv: write_report_csv(report, args.csv)
+    if args.json: write_report_json(report, args.json)
+    print(f"{'id':<24}{'rpm':>7}{'body dmg':>10}{'body dps':>10}{'body ttk':>10}  flags")
+    for row in sorted(report["weapons"], key=lambda r: r["ttk_body"]):
+        flags = " ".join(f for f, on in (("DPS", row["dps_outlier"]), ("TTK", row["ttk_outlier"])) if on)
+        print(f"{row['id']:<24}{row['rpm']:>7.0f}{row['damage_body']:>10.2f}{row['dps_body']:>10.2f}{row['ttk_body']:>10.3f}  {flags}")
@@ -0,0 +1,224 @@
+import re
+from collections import namedtuple
+
+# Declarative form of gun_asset_mapping.md. Each rule names the item category
+# it attributes files to, the asset list the file lands in, the directory it
+# lives in and a filename pattern. "{ns}" is the pack namespace and "{id}" the
+# item id; "{id}" may appear in either the directory or the filename, exactly
+# once. Rules with defines_item=True are the index files that declare an item;
+# every other rule only attaches files to items declared that way.
+#
+# strip_suffix covers optional naming conventions (e.g. "ak47_hud.png" next to
+# "ak47.png"): when the captured id is not a known item, the suffix is removed
+# and the lookup retried.
+#
+# Adding an asset kind is a new row here; the parser still visits every file
+# exactly once.
+AssetRule = namedtuple("AssetRule", "category asset_key directory filename defines_item strip_suffix")
+AssetRule.__new__.__defaults__ = (False, None)
+
+ASSET_KEYS = (
+    "json_files", "model_files", "texture_files", "animation_files",
+    "sound_files", "recipe_files", "tag_files", "script_files",
+)
+
+ITEM_CATEGORIES = ("guns", "ammo", "attachments")
+
+ASSET_RULES = (
+    # --- Guns --- #
+    AssetRule("guns", "json_files", "data/{ns}/index/guns", r"{id}\.json", defines_item=True),
+    AssetRule("guns", "json_files", "data/{ns}/data/guns", r"{id}\.json"),
+    AssetRule("guns", "json_files", "assets/{ns}/display/guns", r"{id}_display\.json"),
+    AssetRule("guns", "model_files", "assets/{ns}/geo_models/gun", r"{id}(?:\.geo)?\.json"),
+    AssetRule("guns", "model_files", "assets/{ns}/geo_models/gun/lod", r"{id}_lod\d+(?:\.geo)?\.json"),
+    AssetRule("guns", "texture_files", "assets/{ns}/textures/gun/uv", r"{id}\.png"),
+    AssetRule("guns", "texture_files", "assets/{ns}/textures/gun/hud", r"{id}\.png", strip_suffix="_hud"),
+    AssetRule("guns", "texture_files", "assets/{ns}/textures/gun/slot", r"{id}\.png"),
+    AssetRule("guns", "texture_files", "assets/{ns}/textures/gun/lod", r"{id}_lod\d+\.png"),
+    AssetRule("guns", "animation_files", "assets/{ns}/animations", r"{id}\.animation\.json"),
+    AssetRule("guns", "animation_files", "assets/{ns}/animations", r"{id}\.gltf"),
+    AssetRule("guns", "sound_files", "assets/{ns}/tacz_sounds/{id}", r"[^/]+\.(?:ogg|wav)"),
+    AssetRule("guns", "recipe_files", "data/{ns}/recipes/gun", r"{id}\.json"),
+    AssetRule("guns", "tag_files", "data/{ns}/tacz_tags/attachments/allow_attachments", r"{id}\.json"),
+    AssetRule("guns", "script_files", "data/{ns}/scripts", r"{id}\.lua", strip_suffix="_gun_logic"),
+    AssetRule("guns", "script_files", "assets/{ns}/scripts", r"{id}\.lua", strip_suffix="_gun_logic"),
+    # --- Ammo --- #
+    AssetRule("ammo", "json_files", "data/{ns}/index/ammo", r"{id}\.json", defines_item=True),
+    AssetRule("ammo", "json_files", "data/{ns}/data/ammo", r"{id}\.json"),
+    AssetRule("ammo", "json_files", "assets/{ns}/display/ammo", r"{id}_display\.json"),
+    AssetRule("ammo", "model_files", "assets/{ns}/geo_models/ammo", r"{id}(?:\.geo)?\.json"),
+    AssetRule("ammo", "model_files", "assets/{ns}/geo_models/ammo_entity", r"{id}(?:\.geo)?\.json"),
+    AssetRule("ammo", "texture_files", "assets/{ns}/textures/ammo/uv", r"{id}\.png"),
+    AssetRule("ammo", "texture_files", "assets/{ns}/textures/ammo/slot", r"{id}\.png"),
+    AssetRule("ammo", "texture_files", "assets/{ns}/textures/ammo_entity", r"{id}\.png"),
+    AssetRule("ammo", "recipe_files", "data/{ns}/recipes/ammo", r"{id}\.json"),
+    # --- Attachments --- #
+    AssetRule("attachments", "json_files", "data/{ns}/index/attachments", r"{id}\.json", defines_item=True),
+    AssetRule("attachments", "json_files", "data/{ns}/data/attachments", r"{id}\.json"),
+    AssetRule("attachments", "json_files", "assets/{ns}/display/attachments", r"{id}_display\.json"),
+    AssetRule("attachments", "model_files", "assets/{ns}/geo_models/attachment", r"{id}(?:\.geo)?\.json"),
+    AssetRule("attachments", "model_files", "assets/{ns}/geo_models/attachment/lod", r"{id}_lod\d+(?:\.geo)?\.json"),
+    AssetRule("attachments", "texture_files", "assets/{ns}/textures/attachment/uv", r"{id}\.png"),
+    AssetRule("attachments", "texture_files", "assets/{ns}/textures/attachment/slot", r"{id}\.png"),
+    AssetRule("attachments", "texture_files", "assets/{ns}/textures/attachment/lod", r"{id}_lod\d+\.png"),
+    AssetRule("attachments", "recipe_files", "data/{ns}/recipes/attachments", r"{id}\.json"),
+)
+
+_INFO_RE = re.compile(r"^(.*?)assets/([^/]+)/gunpack_info\.json$")
+
+
+def detect_root(rel_paths):
+    """Returns (prefix, namespace) from gunpack_info.json locations, preferring the shallowest; None if absent.
+
+    prefix is "" for a pack at the archive/folder root and e.g. "packA/" for
+    one nested in a top-level folder.
+    """
+    best = None
+    for rel_path in rel_paths:
+        m = _INFO_RE.match(rel_path)
+        if m and (best is None or len(m.group(1)) < len(best[0])):
+            best = (m.group(1), m.group(2))
+    return best
+
+
+def asset_type(rel_path, prefix=""):
+    """Reporting bucket: the folder under assets/<ns> or data/<ns> (e.g. textures, geo_models).
+
+    prefix is the gunpack root inside the archive/folder (see detect_root).
+    """
+    if prefix and rel_path.startswith(prefix):
+        rel_path = rel_path[len(prefix):]
+    parts = rel_path.split("/")
+    if len(parts) > 3 and parts[0] in ("assets", "data"):
+        return parts[2]
+    return "other"
+
+
+# Item ids never contain "/" but may contain "." (e.g. "m1911.a1"); the match
+# is non-greedy so extensions such as ".geo.json" stay out of the id.
+_ID_PATTERN = r"[^/]+?"
+
+
+def _rule_regex(rule, index, namespace):
+    directory = rule.directory.replace("{ns}", namespace)
+    id_group = f"(?P<i{index}>{_ID_PATTERN})"
+    if "{id}" in directory:
+        head, tail = directory.split("{id}")
+        dir_re = re.escape(head) + id_group + re.escape(tail)
+        file_re = rule.filename
+    else:
+        dir_re = re.escape(directory)
+        file_re = rule.filename.replace("{id}", id_group)
+    return f"(?P<r{index}>{dir_re}/{file_re})"
+
+
+class AssetMatcher:
+    """All ASSET_RULES for one namespace compiled into a single regex.
+
+    Paths are matched relative to the gunpack root with "/" separators. Each
+    rule is wrapped in its own outer group, so match.lastgroup names the rule
+    that fired without trying the rules one by one.
+    """
+
+    def __init__(self, namespace, rules=ASSET_RULES):
+        self.namespace = namespace
+        self.rules = rules
+        alternatives = [_rule_regex(rule, i, namespace) for i, rule in enumerate(rules)]
+        self.regex = re.compile("^(?:" + "|".join(alternatives) + ")$")
+
+    def match(self, rel_path):
+        """Returns (rule_index, item_id) for a relative path, or None."""
+        m = self.regex.match(rel_path)
+        if not m:
+            return None
+        index = int(m.lastgroup[1:])
+        return index, m.group(f"i{index}")
+
+    def resolve_id(self, rule_index, item_id, known_ids):
+        """Maps a captured id to a declared item id (applying strip_suffix), or None."""
+        if item_id in known_ids:
+            return item_id
+        suffix = self.rules[rule_index].strip_suffix
+        if suffix and item_id.endswith(suffix) and item_id[:-len(suffix)] in known_ids:
+            return item_id[:-len(suffix)]
+        return None
+
+    def category_dirs(self, category):
+        """Directories the rules of a category look in, as (index_dirs, shared_dirs, per_item_dirs).
+
+        per_item_dirs still contain "{id}"; the others are concrete relative paths.
+        """
+        index_dirs, shared_dirs, per_item_dirs = [], [], []
+        for rule in self.rules:
+            if rule.category != category:
+                continue
+            directory = rule.directory.replace("{ns}", self.namespace)
+            target = index_dirs if rule.defines_item else per_item_dirs if "{id}" in directory else shared_dirs
+            if directory not in target:
+                target.append(directory)
+        return index_dirs, shared_dirs, per_item_dirs
+
+    def attribute(self, rel_paths):
+        """Attributes relative paths to the items declared among them.
+
+        Returns (items, unattributed) where items is
+        {category: {item_id: {asset_key: [rel_path, ...]}}} with every category
+        and asset key present, and unattributed lists the paths no item claimed.
+        """
+        matched = []
+        unattributed = []
+        declared = {category: set() for category in ITEM_CATEGORIES}
+        for rel_path in rel_paths:
+            hit = self.match(rel_path)
+            if hit is None:
+                unattributed.append(rel_path)
+                continue
+            matched.append((hit[0], hit[1], rel_path))
+            rule = self.rules[hit[0]]
+            if rule.defines_item:
+                declared[rule.category].add(hit[1])
+
+        items = {category: {item_id: {key: [] for key in ASSET_KEYS} for item_id in ids}
+                 for category, ids in declared.items()}
+        # Rule order gives index/data/display JSON their documented order.
+        matched.sort()
+        for index, item_id, rel_path in matched:
+            rule = self.rules[index]
+            table = items[rule.category]
+            item_id = self.resolve_id(index, item_id, table)
+            if item_id is not None:
+                table[item_id][rule.asset_key].append(rel_path)
+            else:
+                unattributed.append(rel_path)
+        return items, unattributed
+
+
+if __name__ == "__main__":
+    matcher = AssetMatcher("tacz")
+    samples = [
+        "data/tacz/index/guns/ak47.json",
+        "data/tacz/data/guns/ak47.json",
+        "assets/tacz/display/guns/ak47_display.json",
+        "assets/tacz/geo_models/gun/ak47.geo.json",
+        "assets/tacz/geo_models/gun/lod/ak47_lod1.geo.json",
+        "assets/tacz/textures/gun/uv/ak47.png",
+        "assets/tacz/textures/gun/hud/ak47_hud.png",
+        "assets/tacz/textures/gun/slot/ak47.png",
+        "assets/tacz/animations/ak47.animation.json",
+        "assets/tacz/animations/ak47.gltf",
+        "assets/tacz/tacz_sounds/ak47/fire.ogg",
+        "data/tacz/recipes/gun/ak47.json",
+        "data/tacz/tacz_tags/attachments/allow_attachments/ak47.json",
+        "data/tacz/scripts/ak47_gun_logic.lua",
+        "data/tacz/index/attachments/scope_acog.json",
+        "assets/tacz/geo_models/attachment/scope_acog.json",
+        "assets/tacz/textures/gun/uv/unknown_gun.png",
+        "assets/tacz/lang/en_us.json",
+    ]
+    items, unattributed = matcher.attribute(samples)
+    for category, table in items.items():
+        for item_id, assets in table.items():
+            print(f"{category}/{item_id}:")
+            for key, paths in assets.items():
+                if paths: print(f"  {key}: {paths}")
+    print(f"Unattributed: {unattributed}")
@@ -0,0 +1,377 @@
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+
+from gunpack_parser import GunpackParser
+
+# Line-delimited JSON protocol: the client sends one JSON object per line and
+# gets exactly one JSON object back per line. Every request carries an "op";
+# most also carry the "pack" path they refer to.
+#
+#   {"op": "items", "pack": "/packs/foo.zip", "category": "guns"}
+#   {"op": "assets", "pack": "/packs/foo.zip", "category": "guns", "id": "ak47"}
+#   {"op": "stats", "pack": "/packs/foo.zip", "id": "ak47"}
+#   {"op": "invalidate", "pack": "/packs/foo.zip"}
+#   {"op": "status"}
+#   {"op": "shutdown"}
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 47811
+CATEGORY_ATTRS = {"guns": "weapons_data", "ammo": "ammo_data", "attachments": "attachment_data"}
+
+
+def pack_signature(pack_path):
+    """Returns (fingerprint, {directory: mtime_ns}) for a pack; the fingerprint changes whenever its files do.
+
+    The directory map is None for zips, whose own mtime and size are enough.
+    """
+    if os.path.isfile(pack_path):
+        st = os.stat(pack_path)
+        return (st.st_mtime_ns, st.st_size), None
+    latest, count, total = 0, 0, 0
+    dirs = {}
+    for root, _, files in os.walk(pack_path):
+        dirs[root] = os.stat(root).st_mtime_ns
+        latest = max(latest, dirs[root])
+        for fname in files:
+            try:
+                st = os.stat(os.path.join(root, fname))
+            except OSError:
+                continue
+            latest = max(latest, st.st_mtime_ns)
+            count += 1
+            total += st.st_size
+    return (latest, count, total), dirs
+
+
+def dirs_unchanged(dirs):
+    """True when none of the directories changed mtime (files added, removed or renamed)."""
+    for path, mtime in dirs.items():
+        try:
+            if os.stat(path).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def served_files(parser):
+    """Full paths of the files queries read: every item asset plus everything under data/<ns>/data."""
+    paths = set()
+    if parser.path_table is None:
+        return paths
+    for attr in CATEGORY_ATTRS.values():
+        for item in getattr(parser, attr).values():
+            paths.update(parser.path_table.full_path(d, n) for _, d, n in item.iter_files())
+    data_dir = os.path.join(parser.gunpack_root_dir, "data", parser.namespace, "data")
+    for root, _, files in os.walk(data_dir):
+        paths.update(os.path.join(root, fname) for fname in files)
+    return paths
+
+
+def file_stamps(paths):
+    """{path: (mtime_ns, size)}, with None for a file that is gone."""
+    stamps = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamps[path] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamps[path] = None
+    return stamps
+
+
+def estimate_parser_size(parser):
+    """Rough resident size in bytes of a parser's item tables."""
+    total = parser.path_table.memory_size() if parser.path_table else 0
+    for attr in CATEGORY_ATTRS.values():
+        table = getattr(parser, attr)
+        total += sys.getsizeof(table)
+        for item_id, item in table.items():
+            total += sys.getsizeof(item_id) + item.memory_size()
+    return total
+
+
+class _PackEntry:
+    def __init__(self, pack_path):
+        self.pack_path = pack_path
+        self.parser = None
+        self.signature = None
+        self.dirs = None
+        self.files = None
+        self.size = 0
+        self.last_used = time.monotonic()
+        self.active = 0
+        self.lock = asyncio.Lock()
+        self.stats_cache = {}
+        self.stale = False
+
+
+class GunpackDaemon:
+    """Keeps parsed gunpacks resident and answers JSON queries about them."""
+
+    def __init__(self, memory_budget_mb=256, idle_timeout=600, poll_interval=2.0):
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+        self.packs = {}
+        self.server = None
+        self._watch_task = None
+        self._stopped = None
+        self._clients = {}
+
+    # --- Pack cache --- #
+    async def _acquire(self, pack_path):
+        pack_path = os.path.abspath(pack_path)
+        entry = self.packs.get(pack_path)
+        if entry is None:
+            entry = self.packs[pack_path] = _PackEntry(pack_path)
+        entry.active += 1
+        entry.last_used = time.monotonic()
+        try:
+            async with entry.lock:
+                if entry.parser is None:
+                    loop = asyncio.get_running_loop()
+                    signature, dirs = await loop.run_in_executor(None, pack_signature, pack_path)
+                    parser = await loop.run_in_executor(None, GunpackParser, pack_path)
+                    entry.parser, entry.signature, entry.dirs = parser, signature, dirs
+                    if dirs is not None:
+                        entry.files = await loop.run_in_executor(None, lambda: file_stamps(served_files(parser)))
+                    entry.size = estimate_parser_size(parser)
+                    entry.stats_cache = {}
+        except Exception:
+            entry.active -= 1
+            # Requests still waiting on the lock retry the parse in this entry, so keep it reachable.
+            if entry.parser is None and entry.active == 0 and self.packs.get(pack_path) is entry:
+                del self.packs[pack_path]
+            raise
+        self._enforce_budget()
+        return entry
+
+    def _release(self, entry):
+        entry.active -= 1
+        entry.last_used = time.monotonic()
+        if entry.stale and entry.active == 0:
+            self._evict(entry.pack_path)
+
+    def _drop(self, entry):
+        if entry.parser:
+            entry.parser.cleanup()
+        entry.parser = None
+        entry.size = 0
+        entry.stats_cache = {}
+
+    def _evict(self, pack_path):
+        entry = self.packs.get(pack_path)
+        if entry is None:
+            return
+        if entry.active:
+            # Still serving (or loading for) a query; drop it once released.
+            entry.stale = True
+            return
+        del self.packs[pack_path]
+        self._drop(entry)
+
+    def _enforce_budget(self):
+        now = time.monotonic()
+        for pack_path, entry in list(self.packs.items()):
+            if entry.active == 0 and entry.parser and now - entry.last_used > self.idle_timeout:
+                self._evict(pack_path)
+        used = sum(e.size for e in self.packs.values())
+        if used <= self.memory_budget:
+            return
+        # Least recently used idle packs go first; packs serving a query stay.
+        for entry in sorted(self.packs.values(), key=lambda e: e.last_used):
+            if used <= self.memory_budget:
+                break
+            if entry.active == 0 and entry.parser:
+                used -= entry.size
+                self._evict(entry.pack_path)
+
+    def _pack_changed(self, entry):
+        """Stats the pack's directories and the files queries serve; rescans every file only when a directory changed."""
+        if entry.dirs is not None and dirs_unchanged(entry.dirs):
+            return file_stamps(entry.files) != entry.files
+        try:
+            signature, dirs = pack_signature(entry.pack_path)
+        except OSError:
+            return True
+        if signature != entry.signature:
+            return True
+        entry.dirs = dirs
+        return False
+
+    async def _watch_packs(self):
+        # Folder packs: directory mtimes catch added, removed and renamed files;
+        # stamps of the served files (item assets and data/<ns>/data) catch
+        # files rewritten in place. Other files only count once a directory changes.
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            for pack_path, entry in list(self.packs.items()):
+                if entry.parser is None or entry.lock.locked():
+                    continue
+                if await loop.run_in_executor(None, self._pack_changed, entry):
+                    print(f"Daemon: {pack_path} changed on disk, invalidating.")
+                    self._evict(pack_path)
+            self._enforce_budget()
+
+    # --- Query handlers --- #
+    def _category_table(self, entry, request):
+        category = request.get("category", "guns")
+        if category not in CATEGORY_ATTRS:
+            raise ValueError(f"Unknown category '{category}'. Expected one of {sorted(CATEGORY_ATTRS)}.")
+        return getattr(entry.parser, CATEGORY_ATTRS[category])
+
+    def _op_items(self, entry, request):
+        table = self._category_table(entry, request)
+        return {"namespace": entry.parser.namespace, "items": sorted(table.keys())}
+
+    def _op_assets(self, entry, request):
+        table = self._category_table(entry, request)
+        item_id = request.get("id")
+        if item_id not in table:
+            raise KeyError(f"No item '{item_id}' in pack.")
+        return {"id": item_id, "assets": table[item_id]["assets"]}
+
+    def _op_stats(self, entry, request):
+        item_id = request.get("id")
+        if item_id in entry.stats_cache:
+            return entry.stats_cache[item_id]
+        parser = entry.parser
+        if item_id not in parser.weapons_data:
+            raise KeyError(f"No weapon '{item_id}' in pack.")
+        data_path = os.path.join(parser.gunpack_root_dir, f"data/{parser.namespace}/data/guns/{item_id}.json")
+        if not os.path.isfile(data_path):
+            raise FileNotFoundError(f"Weapon '{item_id}' has no data file.")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            result = {"id": item_id, "stats": json.load(f)}
+        entry.stats_cache[item_id] = result
+        return result
+
+    def _op_status(self):
+        return {
+            "packs": [
+                {"pack": e.pack_path, "loaded": e.parser is not None, "size": e.size,
+                 "idle_seconds": round(time.monotonic() - e.last_used, 1)}
+                for e in self.packs.values()
+            ],
+            "memory_used": sum(e.size for e in self.packs.values()),
+            "memory_budget": self.memory_budget,
+        }
+
+    async def handle_request(self, request):
+        op = request.get("op")
+        if op == "status":
+            return self._op_status()
+        if op == "shutdown":
+            self._stopped.set()
+            return {"stopping": True}
+        pack_path = request.get("pack")
+        if not pack_path:
+            raise ValueError("Request is missing 'pack'.")
+        if op == "invalidate":
+            self._evict(os.path.abspath(pack_path))
+            return {"invalidated": pack_path}
+        handler = {"items": self._op_items, "assets": self._op_assets, "stats": self._op_stats}.get(op)
+        if handler is None:
+            raise ValueError(f"Unknown op '{op}'.")
+        entry = await self._acquire(pack_path)
+        try:
+            return handler(entry, request)
+        finally:
+            self._release(entry)
+
+    async def _serve_client(self, reader, writer):
+        self._clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    response = {"ok": True, "result": await self.handle_request(request)}
+                except Exception as e:
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            writer.close()
+
+    # --- Lifecycle --- #
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_socket=None):
+        self._stopped = asyncio.Event()
+        if unix_socket:
+            if os.path.exists(unix_socket): os.remove(unix_socket)
+            self.server = await asyncio.start_unix_server(self._serve_client, path=unix_socket)
+            print(f"Daemon: Listening on unix socket {unix_socket}")
+        else:
+            self.server = await asyncio.start_server(self._serve_client, host=host, port=port)
+            print(f"Daemon: Listening on {host}:{port}")
+        self._watch_task = asyncio.create_task(self._watch_packs())
+        try:
+            await self._stopped.wait()
+        finally:
+            self._watch_task.cancel()
+            self.server.close()
+            for writer in list(self._clients):
+                writer.close()
+            await asyncio.gather(*self._clients.values(), return_exceptions=True)
+            await self.server.wait_closed()
+            for pack_path in list(self.packs):
+                self._evict(pack_path)
+            if unix_socket and os.path.exists(unix_socket): os.remove(unix_socket)
+
+
+class DaemonClient:
+    """Blocking client for build scripts; keeps one connection open across queries."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_socket=None, timeout=60):
+        if unix_socket:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(unix_socket)
+        else:
+            self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.stream = self.sock.makefile('rwb')
+
+    def query(self, op, **kwargs):
+        kwargs["op"] = op
+        self.stream.write(json.dumps(kwargs).encode('utf-8') + b"\n")
+        self.stream.flush()
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError("Daemon closed the connection.")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise Exception(f"Daemon error: {response['error']}")
+        return response["result"]
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Serve parsed TACZ gunpacks from memory.")
+    arg_parser.add_argument("--host", default=DEFAULT_HOST)
+    arg_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    arg_parser.add_argument("--unix-socket", help="Listen on a unix socket instead of TCP.")
+    arg_parser.add_argument("--memory-budget-mb", type=float, default=256)
+    arg_parser.add_argument("--idle-timeout", type=float, default=600, help="Seconds before an unused pack is dropped.")
+    arg_parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between change checks.")
+    args = arg_parser.parse_args()
+
+    daemon = GunpackDaemon(args.memory_budget_mb, args.idle_timeout, args.poll_interval)
+    try:
+        asyncio.run(daemon.serve(args.host, args.port, args.unix_socket))
+    except KeyboardInterrupt:
+        print("Daemon: Stopped.")
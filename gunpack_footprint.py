@@ -0,0 +1,182 @@
+import os
+import struct
+import zipfile
+import argparse
+
+from gunpack_asset_rules import AssetMatcher, ASSET_KEYS, ITEM_CATEGORIES, asset_type, detect_root
+
+# Disk footprint per item. For a zip everything comes from the sizes recorded
+# in the central directory, so nothing is decompressed or extracted; for a
+# folder each file is stat()ed once. Files are attributed to items with the
+# same rule table the parser uses; anything left over is reported as
+# shared/unattributed, grouped by asset folder.
+
+_EOCD_SIG = b"PK\x05\x06"
+_CDIR_SIG = b"PK\x01\x02"
+_CDIR_HEADER = struct.Struct("<4s4x2H8x2I3H8xI")
+
+
+def _read_central_directory(zip_path):
+    """{member name: (size, compressed_size)} straight from the central directory.
+
+    Skips building ZipInfo objects, which dominates zipfile's cost on archives
+    with tens of thousands of members. Returns None for archives it does not
+    handle (ZIP64, split or malformed), so the caller can fall back to zipfile.
+    """
+    with open(zip_path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        tail_size = min(file_size, 65536 + 22)
+        f.seek(file_size - tail_size)
+        tail = f.read()
+        eocd = tail.rfind(_EOCD_SIG)
+        if eocd < 0 or eocd + 22 > len(tail):
+            return None
+        disk, cd_disk, _, entries, cd_size, cd_offset = struct.unpack_from("<4H2I", tail, eocd + 4)
+        if disk or cd_disk or entries == 0xFFFF or cd_offset == 0xFFFFFFFF:
+            return None
+        # Data prepended to the archive (e.g. self-extracting stubs) shifts every offset.
+        cd_start = file_size - tail_size + eocd - cd_size
+        if cd_start < 0:
+            return None
+        f.seek(cd_start)
+        data = f.read(cd_size)
+    if len(data) != cd_size:
+        return None
+    sizes = {}
+    pos = 0
+    unpack = _CDIR_HEADER.unpack_from
+    for _ in range(entries):
+        if pos + 46 > len(data):
+            return None
+        sig, flags, _, compressed, size, name_len, extra_len, comment_len, _ = unpack(data, pos)
+        if sig != _CDIR_SIG or size == 0xFFFFFFFF or compressed == 0xFFFFFFFF:
+            return None
+        if pos + 46 + name_len + extra_len + comment_len > len(data):
+            return None
+        raw_name = data[pos + 46:pos + 46 + name_len]
+        name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+        if not name.endswith("/"):
+            sizes[name] = (size, compressed)
+        pos += 46 + name_len + extra_len + comment_len
+    return sizes
+
+
+def _list_sizes(pack_path):
+    """Returns {path relative to the archive/folder: (size, compressed_size)}."""
+    sizes = {}
+    if os.path.isfile(pack_path) and pack_path.endswith(".zip"):
+        fast = _read_central_directory(pack_path)
+        if fast is not None:
+            return fast
+        with zipfile.ZipFile(pack_path, "r") as zip_ref:
+            for info in zip_ref.infolist():
+                if not info.is_dir():
+                    sizes[info.filename] = (info.file_size, info.compress_size)
+    elif os.path.isdir(pack_path):
+        for root, dirs, files in os.walk(pack_path):
+            rel_dir = os.path.relpath(root, pack_path).replace(os.sep, "/")
+            prefix = "" if rel_dir == "." else rel_dir + "/"
+            for fname in files:
+                try:
+                    size = os.stat(os.path.join(root, fname)).st_size
+                except OSError:
+                    continue
+                sizes[prefix + fname] = (size, size)
+    else:
+        raise Exception(f"Invalid pack path: {pack_path}. Must be a directory or .zip file.")
+    return sizes
+
+
+def compute_footprint(pack_path):
+    """Uncompressed/compressed bytes per item and per asset kind, plus unattributed files.
+
+    For folders the "compressed" figures equal the on-disk sizes.
+    """
+    raw_sizes = _list_sizes(pack_path)
+    root = detect_root(raw_sizes)
+    if root is None:
+        raise Exception(f"Could not find assets/<namespace>/gunpack_info.json in {pack_path}.")
+    prefix, namespace = root
+    files = {name[len(prefix):]: sizes for name, sizes in raw_sizes.items() if name.startswith(prefix)}
+
+    items, unattributed = AssetMatcher(namespace).attribute(files)
+    footprint = {
+        "pack": pack_path,
+        "namespace": namespace,
+        "from_zip": os.path.isfile(pack_path),
+        "files": files,
+        "items": {category: {} for category in ITEM_CATEGORIES},
+        "unattributed": {"files": 0, "size": 0, "compressed": 0, "by_folder": {}},
+        "totals": {"files": len(files), "size": sum(s for s, _ in files.values()),
+                   "compressed": sum(c for _, c in files.values())},
+    }
+    for category, table in items.items():
+        for item_id, assets in table.items():
+            entry = {"files": 0, "size": 0, "compressed": 0, "by_kind": {}}
+            for asset_key in ASSET_KEYS:
+                kind_size = kind_compressed = 0
+                for rel_path in assets[asset_key]:
+                    size, compressed = files[rel_path]
+                    kind_size += size
+                    kind_compressed += compressed
+                if assets[asset_key]:
+                    entry["by_kind"][asset_key] = {"files": len(assets[asset_key]), "size": kind_size,
+                                                   "compressed": kind_compressed}
+                    entry["files"] += len(assets[asset_key])
+                    entry["size"] += kind_size
+                    entry["compressed"] += kind_compressed
+            footprint["items"][category][item_id] = entry
+    shared = footprint["unattributed"]
+    for rel_path in unattributed:
+        size, compressed = files[rel_path]
+        folder = shared["by_folder"].setdefault(asset_type(rel_path), {"files": 0, "size": 0, "compressed": 0})
+        for stats in (shared, folder):
+            stats["files"] += 1
+            stats["size"] += size
+            stats["compressed"] += compressed
+    return footprint
+
+
+def top_items(footprint, n=20, sort_key="compressed", categories=None):
+    """[(category, item_id, entry), ...] sorted by size or compressed size, largest first."""
+    rows = [(category, item_id, entry)
+            for category, table in footprint["items"].items() if categories is None or category in categories
+            for item_id, entry in table.items()]
+    rows.sort(key=lambda row: row[2][sort_key], reverse=True)
+    return rows[:n] if n else rows
+
+
+def format_size(num_bytes):
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024.0
+    return f"{num_bytes:.1f} GB"
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Report which items make a TACZ gunpack large.")
+    arg_parser.add_argument("pack", help="Gunpack folder or .zip")
+    arg_parser.add_argument("--top", type=int, default=20, help="Number of items to list (0 for all).")
+    arg_parser.add_argument("--sort", choices=("compressed", "size", "files"), default="compressed")
+    arg_parser.add_argument("--category", choices=ITEM_CATEGORIES, action="append",
+                            help="Only list this category (repeatable).")
+    arg_parser.add_argument("--by-kind", action="store_true", help="Break each item down by asset kind.")
+    args = arg_parser.parse_args()
+
+    result = compute_footprint(args.pack)
+    totals = result["totals"]
+    print(f"{result['pack']} [{result['namespace']}]: {totals['files']} files, "
+          f"{format_size(totals['size'])} uncompressed, {format_size(totals['compressed'])} "
+          f"{'compressed' if result['from_zip'] else 'on disk'}")
+    print(f"{'Item':<40}{'Files':>7}{'Size':>12}{'Compressed':>12}")
+    for category, item_id, entry in top_items(result, args.top, args.sort, args.category):
+        print(f"{category + '/' + item_id:<40}{entry['files']:>7}{format_size(entry['size']):>12}{format_size(entry['compressed']):>12}")
+        if args.by_kind:
+            for kind, stats in sorted(entry["by_kind"].items(), key=lambda kv: -kv[1][args.sort]):
+                print(f"    {kind:<36}{stats['files']:>7}{format_size(stats['size']):>12}{format_size(stats['compressed']):>12}")
+    shared = result["unattributed"]
+    print(f"{'(shared/unattributed)':<40}{shared['files']:>7}{format_size(shared['size']):>12}{format_size(shared['compressed']):>12}")
+    for folder, stats in sorted(shared["by_folder"].items(), key=lambda kv: -kv[1][args.sort]):
+        print(f"    {folder:<36}{stats['files']:>7}{format_size(stats['size']):>12}{format_size(stats['compressed']):>12}")
@@ -0,0 +1,120 @@
+import os
+import sys
+from array import array
+
+from gunpack_asset_rules import ASSET_KEYS
+
+# Compact storage for parsed items. Every asset path is split into a directory
+# id (an index into the pack's PathTable) and an interned filename, so the
+# gunpack root / temp-dir prefix and each directory are stored once per pack
+# instead of once per file. Filenames that start with the item id (nearly all
+# of them) only keep the remainder, e.g. "_display.json", which is then shared
+# by every item. Full paths are only built when a caller asks for them.
+
+_KEY_INDEX = {key: i for i, key in enumerate(ASSET_KEYS)}
+_ID_PREFIXED = 0x80 # Flag in an ItemRecord key byte: the stored name omits the item id prefix.
+
+
+class PathTable:
+    """Shared directory string table for one pack root."""
+
+    __slots__ = ("root", "dirs", "_dir_ids")
+
+    def __init__(self, root):
+        self.root = root
+        self.dirs = []  # relative, "/"-separated
+        self._dir_ids = {}
+
+    def add_dir(self, rel_dir):
+        dir_id = self._dir_ids.get(rel_dir)
+        if dir_id is None:
+            dir_id = self._dir_ids[rel_dir] = len(self.dirs)
+            self.dirs.append(rel_dir)
+        return dir_id
+
+    def full_path(self, dir_id, name):
+        rel_dir = self.dirs[dir_id]
+        if not rel_dir:
+            return os.path.join(self.root, name)
+        return os.path.join(self.root, *rel_dir.split("/"), name)
+
+    def rel_path(self, dir_id, name):
+        rel_dir = self.dirs[dir_id]
+        return f"{rel_dir}/{name}" if rel_dir else name
+
+    def memory_size(self):
+        """Approximate bytes held by the table itself."""
+        return sys.getsizeof(self.dirs) + sys.getsizeof(self._dir_ids) + sum(sys.getsizeof(d) for d in self.dirs)
+
+
+class ItemRecord:
+    """One weapon/ammo/attachment: parallel arrays of (asset key, directory id, filename).
+
+    Supports item["id"], item["assets"] and item.get(...) like the plain dicts
+    the parser used to store, but "assets" is built on each access.
+    """
+
+    __slots__ = ("id", "_table", "_keys", "_dirs", "_names")
+
+    def __init__(self, item_id, table, assets):
+        """assets maps asset key -> list of "/"-separated paths relative to table.root."""
+        self.id = item_id
+        self._table = table
+        keys, dirs, names = bytearray(), array("I"), []
+        for key, rel_paths in assets.items():
+            key_index = _KEY_INDEX[key]
+            for rel_path in rel_paths:
+                rel_dir, _, name = rel_path.rpartition("/")
+                dirs.append(table.add_dir(rel_dir))
+                if name.startswith(item_id):
+                    keys.append(key_index | _ID_PREFIXED)
+                    names.append(sys.intern(name[len(item_id):]))
+                else:
+                    keys.append(key_index)
+                    names.append(sys.intern(name))
+        self._keys = bytes(keys)
+        self._dirs = dirs
+        self._names = tuple(names)
+
+    def iter_files(self):
+        """Yields (asset_key, dir_id, filename) without building any path strings."""
+        for key_index, dir_id, name in zip(self._keys, self._dirs, self._names):
+            if key_index & _ID_PREFIXED:
+                yield ASSET_KEYS[key_index & ~_ID_PREFIXED], dir_id, self.id + name
+            else:
+                yield ASSET_KEYS[key_index], dir_id, name
+
+    def rel_paths(self, asset_key=None):
+        return [self._table.rel_path(d, n) for k, d, n in self.iter_files() if asset_key in (None, k)]
+
+    def paths(self, asset_key):
+        return [self._table.full_path(d, n) for k, d, n in self.iter_files() if k == asset_key]
+
+    @property
+    def assets(self):
+        assets = {key: [] for key in ASSET_KEYS}
+        for key, dir_id, name in self.iter_files():
+            assets[key].append(self._table.full_path(dir_id, name))
+        return assets
+
+    def to_dict(self):
+        return {"id": self.id, "assets": self.assets}
+
+    def __getitem__(self, key):
+        if key == "id": return self.id
+        if key == "assets": return self.assets
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def memory_size(self):
+        """Approximate bytes held by this record, excluding shared interned names."""
+        return (sys.getsizeof(self) + sys.getsizeof(self._keys) + sys.getsizeof(self._dirs)
+                + sys.getsizeof(self._names))
+
+    def __repr__(self):
+        return f"ItemRecord({self.id!r}, {len(self._names)} files)"
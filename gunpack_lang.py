@@ -0,0 +1,199 @@
+import sys
+import json
+import argparse
+from array import array
+
+from gunpack_parser import GunpackParser
+from gunpack_asset_rules import ITEM_CATEGORIES
+
+# Translations from assets/<ns>/lang/<locale>.json of one or more packs, kept
+# in a single table shared by every locale: each key and each distinct string
+# is stored once, and a locale is just an array of string ids indexed by key
+# id (0 = not translated). Thousands of keys times dozens of locales cost a
+# few bytes per translation instead of a dict entry each, and identical
+# strings (untranslated English copied into other locales, repeated names) are
+# shared.
+
+DEFAULT_LOCALES = ("en_us", "zh_cn")
+# Singular folder names TACZ uses in fallback translation keys (e.g. "tacz.gun.ak47.name").
+_KEY_CATEGORY = {"guns": "gun", "ammo": "ammo", "attachments": "attachment"}
+
+
+class LangTable:
+    def __init__(self):
+        self.keys = []
+        self._key_ids = {}
+        self.strings = [None] # string id 0 is reserved for "missing"
+        self._string_ids = {}
+        self.locales = {}     # locale -> array('I') of string ids, indexed by key id
+
+    def _key_id(self, key):
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            key = sys.intern(key)
+            key_id = self._key_ids[key] = len(self.keys)
+            self.keys.append(key)
+        return key_id
+
+    def _string_id(self, text):
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = self._string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def set(self, locale, key, text):
+        column = self.locales.get(locale)
+        if column is None:
+            column = self.locales[locale] = array("I")
+        key_id = self._key_id(key)
+        if len(column) <= key_id:
+            column.extend([0] * (key_id + 1 - len(column)))
+        column[key_id] = self._string_id(text)
+
+    def get(self, locale, key, default=None):
+        column = self.locales.get(locale)
+        key_id = self._key_ids.get(key)
+        if column is None or key_id is None or key_id >= len(column) or not column[key_id]:
+            return default
+        return self.strings[column[key_id]]
+
+    def lookup(self, key, locales=DEFAULT_LOCALES):
+        """First translation of key among locales, then any locale; None if untranslated."""
+        for locale in tuple(locales) + tuple(self.locales):
+            text = self.get(locale, key)
+            if text is not None:
+                return text
+        return None
+
+    def locale_keys(self, locale):
+        column = self.locales.get(locale, ())
+        return {self.keys[key_id] for key_id, string_id in enumerate(column) if string_id}
+
+    def load_pack(self, parser):
+        """Adds every locale file of a parsed pack; later packs override earlier ones. Returns locales read."""
+        if not parser.namespace:
+            return []
+        lang_dir = f"assets/{parser.namespace}/lang"
+        loaded = []
+        for fname in parser.list_files(lang_dir):
+            if not fname.endswith(".json"):
+                continue
+            locale = fname[:-5].lower()
+            try:
+                entries = json.loads(parser.read_bytes(f"{lang_dir}/{fname}").decode("utf-8-sig"))
+            except Exception as e:
+                print(f"Warning: Could not parse lang file {lang_dir}/{fname}: {e}")
+                continue
+            if not isinstance(entries, dict):
+                print(f"Warning: Lang file {lang_dir}/{fname} is not a JSON object, skipping.")
+                continue
+            for key, text in entries.items():
+                if isinstance(text, str):
+                    self.set(locale, key, text)
+            loaded.append(locale)
+        return loaded
+
+    def memory_size(self):
+        """Approximate bytes held by the table."""
+        return (sys.getsizeof(self.keys) + sys.getsizeof(self._key_ids) + sum(sys.getsizeof(k) for k in self.keys)
+                + sys.getsizeof(self.strings) + sys.getsizeof(self._string_ids)
+                + sum(sys.getsizeof(t) for t in self.strings)
+                + sum(sys.getsizeof(c) for c in self.locales.values()))
+
+
+def _item_ids(parser, category):
+    """Item ids from the index folder, without resolving (or extracting) the items' assets."""
+    index_dir = f"data/{parser.namespace}/index/{category}"
+    return [fname[:-5] for fname in parser.list_files(index_dir) if fname.endswith(".json")]
+
+
+def item_lang_keys(parser, category, item_id):
+    """Translation keys an item refers to: the "name"/"tooltip" of its index file, else the TACZ default name key."""
+    keys = []
+    index_path = f"data/{parser.namespace}/index/{category}/{item_id}.json"
+    try:
+        index = json.loads(parser.read_bytes(index_path).decode("utf-8-sig"))
+    except Exception:
+        index = {}
+    if not isinstance(index, dict):
+        print(f"Warning: Index file {index_path} is not a JSON object, using the default name key.")
+        index = {}
+    for field in ("name", "tooltip"):
+        if isinstance(index.get(field), str):
+            keys.append(index[field])
+    if not keys:
+        keys.append(f"{parser.namespace}.{_KEY_CATEGORY[category]}.{item_id}.name")
+    return keys
+
+
+def display_names(parser, lang, category="guns", locales=DEFAULT_LOCALES):
+    """{item_id: display name} for the items of a category that have a translated name."""
+    names = {}
+    for item_id in _item_ids(parser, category):
+        text = lang.lookup(item_lang_keys(parser, category, item_id)[0], locales)
+        if text is not None:
+            names[item_id] = text
+    return names
+
+
+def coverage_report(parsers, lang, reference_locale="en_us"):
+    """Per locale: translation keys missing and orphaned.
+
+    Orphaned keys are item keys ("<ns>.gun.*", "<ns>.ammo.*",
+    "<ns>.attachment.*" of a parsed pack) that no parsed item refers to.
+    A key is expected when a parsed item refers to it, or when the reference
+    locale defines it and it is not orphaned; missing keys are expected keys
+    a locale lacks.
+    """
+    item_keys = set()
+    prefixes = []
+    for parser in parsers:
+        if not parser.namespace: continue
+        prefixes.extend(f"{parser.namespace}.{name}." for name in _KEY_CATEGORY.values())
+        for category in ITEM_CATEGORIES:
+            for item_id in _item_ids(parser, category):
+                item_keys.update(item_lang_keys(parser, category, item_id))
+    prefixes = tuple(prefixes)
+
+    def orphans(keys):
+        return {key for key in keys if key.startswith(prefixes) and key not in item_keys}
+
+    reference_keys = lang.locale_keys(reference_locale)
+    expected = item_keys | (reference_keys - orphans(reference_keys))
+    report = {}
+    for locale in sorted(lang.locales):
+        present = lang.locale_keys(locale)
+        report[locale] = {
+            "translated": len(present & expected),
+            "expected": len(expected),
+            "missing": sorted(expected - present),
+            "orphaned": sorted(orphans(present)),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Translation coverage across one or more TACZ gunpacks.")
+    arg_parser.add_argument("packs", nargs="+", help="Gunpack folders or .zip files, in load order.")
+    arg_parser.add_argument("--reference", default="en_us", help="Locale whose keys every locale should have.")
+    arg_parser.add_argument("--list", type=int, default=10, help="Missing/orphaned keys to print per locale.")
+    args = arg_parser.parse_args()
+
+    lang = LangTable()
+    parsers = []
+    try:
+        for pack_path in args.packs:
+            parser = GunpackParser(pack_path, lazy=True)
+            parsers.append(parser)
+            lang.load_pack(parser)
+        report = coverage_report(parsers, lang, args.reference)
+        print(f"{len(lang.keys)} keys, {len(lang.strings) - 1} distinct strings, {len(lang.locales)} locales, "
+              f"~{lang.memory_size() // 1024} KB")
+        for locale, stats in report.items():
+            print(f"{locale}: {stats['translated']}/{stats['expected']} translated, "
+                  f"{len(stats['missing'])} missing, {len(stats['orphaned'])} orphaned")
+            for key in stats["missing"][:args.list]: print(f"    missing:  {key}")
+            for key in stats["orphaned"][:args.list]: print(f"    orphaned: {key}")
+    finally:
+        for parser in parsers: parser.cleanup()
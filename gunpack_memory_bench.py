@@ -0,0 +1,82 @@
+import gc
+import os
+import sys
+import argparse
+import tempfile
+import tracemalloc
+
+from gunpack_generator import create_tacz_gunpack_structure
+from gunpack_parser import GunpackParser
+
+# Measures how much memory parsed item tables keep per item, using tracemalloc
+# on a synthetic pack. The compact ItemRecord tables are compared with the
+# dict-of-lists-of-full-paths layout the parser used to store.
+
+SOUND_NAMES = ("fire.ogg", "reload_empty.ogg", "reload_tactical.ogg", "draw.ogg", "inspect.ogg")
+
+
+def _touch(path):
+    with open(path, "w") as f:
+        f.write("{}")
+
+
+def build_synthetic_pack(base_dir, item_count, namespace="bench"):
+    """Creates item_count guns, each with the usual JSON, model, texture and sound files."""
+    root = create_tacz_gunpack_structure(base_dir, "bench_pack", namespace)
+    a, d = f"assets/{namespace}", f"data/{namespace}"
+    for i in range(item_count):
+        gun_id = f"bench_rifle_{i:05d}"
+        for rel in (f"{d}/index/guns/{gun_id}.json", f"{d}/data/guns/{gun_id}.json",
+                    f"{a}/display/guns/{gun_id}_display.json", f"{a}/geo_models/gun/{gun_id}.geo.json",
+                    f"{a}/geo_models/gun/lod/{gun_id}_lod1.geo.json", f"{a}/textures/gun/uv/{gun_id}.png",
+                    f"{a}/textures/gun/slot/{gun_id}.png", f"{a}/animations/{gun_id}.animation.json",
+                    f"{d}/recipes/gun/{gun_id}.json"):
+            _touch(os.path.join(root, rel))
+        sound_dir = os.path.join(root, f"{a}/tacz_sounds/{gun_id}")
+        os.makedirs(sound_dir, exist_ok=True)
+        for name in SOUND_NAMES:
+            _touch(os.path.join(sound_dir, name))
+    return root
+
+
+def _retained(build):
+    """Bytes still allocated after build() returns, plus its result."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def measure_item_memory(item_count=10000):
+    with tempfile.TemporaryDirectory(prefix="tacz_membench_") as base_dir:
+        root = build_synthetic_pack(base_dir, item_count)
+        compact_bytes, parser = _retained(lambda: GunpackParser(root))
+        items = len(parser.weapons_data)
+        # The pre-compaction layout: one dict per item holding lists of full path strings.
+        legacy_bytes, legacy = _retained(
+            lambda: {item_id: {"id": item_id, "assets": record.assets} for item_id, record in parser.weapons_data.items()})
+        files = sum(len(paths) for item in legacy.values() for paths in item["assets"].values())
+        parser.cleanup()
+    return {"items": items, "files": files, "compact_bytes": compact_bytes, "legacy_bytes": legacy_bytes}
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Measure per-item memory of parsed gunpack tables.")
+    arg_parser.add_argument("--items", type=int, default=10000)
+    args = arg_parser.parse_args()
+
+    print(f"Building a synthetic pack with {args.items} guns...")
+    result = measure_item_memory(args.items)
+    n = result["items"] or 1
+    print(f"Items: {result['items']}, files attributed: {result['files']}")
+    print(f"Compact tables (parser, incl. path table): {result['compact_bytes']:>12} bytes "
+          f"({result['compact_bytes'] / n:.0f} bytes/item)")
+    print(f"Full-path dict-of-lists tables:             {result['legacy_bytes']:>12} bytes "
+          f"({result['legacy_bytes'] / n:.0f} bytes/item)")
+    if result["compact_bytes"]:
+        print(f"Ratio: {result['legacy_bytes'] / result['compact_bytes']:.1f}x smaller")
+    sys.exit(0)
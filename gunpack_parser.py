@@ -6,13 +6,23 @@ import json
 import shutil
 import subprocess
 import sys
+import bisect
+import itertools
 
 # Ensure gunpack_generator is importable for testing incremental add
 from gunpack_generator import add_new_weapon_files, add_new_ammo_files, add_new_attachment_files
+from gunpack_asset_rules import AssetMatcher, ASSET_KEYS, ITEM_CATEGORIES
+from gunpack_item_table import PathTable, ItemRecord
 
 class GunpackParser:
-    def __init__(self, pack_path):
+    def __init__(self, pack_path, lazy=False):
+        """Parses pack_path (folder or .zip).
+
+        With lazy=True nothing is resolved up front (and a zip is not
+        extracted); use iter_items() to resolve items on demand.
+        """
         self.pack_path = pack_path
+        self.lazy = lazy
         self.temp_dir_obj = None
         self.gunpack_root_dir = None
         self.namespace = None
@@ -20,6 +30,14 @@ class GunpackParser:
         self.weapons_data = {}
         self.ammo_data = {}
         self.attachment_data = {}
+        self.path_table = None
+        self._matcher = None
+        self._zip_ref = None
+        self._zip_dirs = None
+        self._zip_prefix = ""
+        self._dir_listings = {}
+        self._index_ids = {}
+        self._complete_categories = set()
 
         self._load_pack()
 
@@ -71,8 +89,15 @@ class GunpackParser:
             self.temp_dir_obj = tempfile.TemporaryDirectory(prefix="tacz_viewer_")
             extracted_zip_path = self.temp_dir_obj.name
             try:
-                with zipfile.ZipFile(self.pack_path, 'r') as zip_ref:
-                    zip_ref.extractall(extracted_zip_path)
+                if self.lazy:
+                    # Only gunpack_info.json is needed to find the root; the rest is extracted per item.
+                    self._zip_ref = zipfile.ZipFile(self.pack_path, 'r')
+                    for member in self._zip_ref.namelist():
+                        if member.endswith("gunpack_info.json"):
+                            self._zip_ref.extract(member, extracted_zip_path)
+                else:
+                    with zipfile.ZipFile(self.pack_path, 'r') as zip_ref:
+                        zip_ref.extractall(extracted_zip_path)
                 
                 if not self._find_gunpack_root_and_namespace(extracted_zip_path):
                     extracted_items = os.listdir(extracted_zip_path)
@@ -84,6 +109,8 @@ class GunpackParser:
                     else:
                         self.gunpack_root_dir = extracted_zip_path
                         print(f"Warning: Could not determine namespace from extracted zip contents of {self.pack_path} via gunpack_info.json.")
+                if self._zip_ref:
+                    self._index_zip_members(extracted_zip_path)
             except Exception as e:
                 self.cleanup()
                 raise Exception(f"Failed to extract or process zip file: {e}")
@@ -91,64 +118,156 @@ class GunpackParser:
             raise Exception(f"Invalid pack path: {self.pack_path}. Must be a directory or .zip file.")
 
         if self.gunpack_root_dir and self.namespace:
-            self._parse_all_items()
+            self._matcher = AssetMatcher(self.namespace)
+            self.path_table = PathTable(self.gunpack_root_dir)
+            if not self.lazy:
+                self._parse_all_items()
         elif self.gunpack_root_dir:
             print(f"Warning: Gunpack root is 	'{self.gunpack_root_dir}	' but namespace could not be determined. Viewer and modification features will be limited.")
         else:
              raise Exception("Could not determine gunpack root directory. Cannot load pack.")
 
-    def _parse_item_category(self, category_name, data_dict):
-        if not self.gunpack_root_dir or not self.namespace: return
-        
-        index_dir = os.path.join(self.gunpack_root_dir, f"data/{self.namespace}/index/{category_name}")
-        data_dir = os.path.join(self.gunpack_root_dir, f"data/{self.namespace}/data/{category_name}")
-        display_dir = os.path.join(self.gunpack_root_dir, f"assets/{self.namespace}/display/{category_name}")
-        geo_dir_name = 'gun' if category_name == 'guns' else category_name # Handle 'gun' vs 'guns'
-        geo_dir = os.path.join(self.gunpack_root_dir, f"assets/{self.namespace}/geo_models/{geo_dir_name}")
-        texture_dir_uv_name = 'gun' if category_name == 'guns' else category_name
-        texture_dir_uv = os.path.join(self.gunpack_root_dir, f"assets/{self.namespace}/textures/{texture_dir_uv_name}/uv")
-        texture_dir_slot = os.path.join(self.gunpack_root_dir, f"assets/{self.namespace}/textures/{texture_dir_uv_name}/slot")
-        sound_base_dir = os.path.join(self.gunpack_root_dir, f"assets/{self.namespace}/tacz_sounds")
-
-        if os.path.isdir(index_dir):
-            for fname in os.listdir(index_dir):
-                if fname.endswith(".json"):
-                    item_id = fname[:-5]
-                    item_assets = {"json_files": [], "model_files": [], "texture_files": [], "sound_files": []}
-                    
-                    for d, n_suffix in [(index_dir, ""), (data_dir, ""), (display_dir, "_display")]:
-                        p = os.path.join(d, f"{item_id}{n_suffix}.json")
-                        if os.path.isfile(p): item_assets["json_files"].append(p)
-                    
-                    if os.path.isdir(geo_dir):
-                        for m_fname in os.listdir(geo_dir):
-                            if item_id in m_fname and m_fname.endswith(".json"): 
-                                item_assets["model_files"].append(os.path.join(geo_dir, m_fname))
-                    
-                    for tex_d in [texture_dir_uv, texture_dir_slot]:
-                        if os.path.isdir(tex_d):
-                            for t_fname in os.listdir(tex_d):
-                                if item_id in t_fname and t_fname.endswith(".png"): 
-                                    item_assets["texture_files"].append(os.path.join(tex_d, t_fname))
-                    
-                    if category_name == "guns":
-                        s_dir = os.path.join(sound_base_dir, item_id)
-                        if os.path.isdir(s_dir):
-                            for sf in os.listdir(s_dir):
-                                if sf.endswith(".ogg") or sf.endswith(".wav"): 
-                                    item_assets["sound_files"].append(os.path.join(s_dir, sf))
-                    
-                    data_dict[item_id] = {"id": item_id, "assets": item_assets}
+    def _collect_rel_paths(self):
+        """Single traversal of the namespace's assets/ and data/ trees."""
+        rel_paths = []
+        for top in (f"assets/{self.namespace}", f"data/{self.namespace}"):
+            top_dir = os.path.join(self.gunpack_root_dir, top)
+            for root, dirs, files in os.walk(top_dir):
+                rel_dir = os.path.relpath(root, self.gunpack_root_dir).replace(os.sep, "/")
+                rel_paths.extend(f"{rel_dir}/{fname}" for fname in files)
+        return rel_paths
 
     def _parse_all_items(self):
-        self._parse_item_category("guns", self.weapons_data)
-        self._parse_item_category("ammo", self.ammo_data)
-        self._parse_item_category("attachments", self.attachment_data)
+        if not self.gunpack_root_dir or not self.namespace: return
+
+        items, _ = self._matcher.attribute(self._collect_rel_paths())
+        for category in ITEM_CATEGORIES:
+            data_dict = self.get_category_data(category)
+            for item_id in sorted(items[category]):
+                data_dict[item_id] = ItemRecord(item_id, self.path_table, items[category][item_id])
+            self._complete_categories.add(category)
+
+    def get_category_data(self, category):
+        return {"guns": self.weapons_data, "ammo": self.ammo_data, "attachments": self.attachment_data}[category]
+
+    # --- Lazy, per-item resolution --- #
+    def _index_zip_members(self, extracted_zip_path):
+        """Groups zip member names by directory, relative to the gunpack root."""
+        prefix = os.path.relpath(self.gunpack_root_dir, extracted_zip_path).replace(os.sep, "/")
+        prefix = "" if prefix == "." else prefix + "/"
+        self._zip_prefix = prefix
+        self._zip_dirs = {}
+        for member in self._zip_ref.namelist():
+            if member.startswith(prefix) and not member.endswith("/"):
+                rel_dir, _, fname = member[len(prefix):].rpartition("/")
+                self._zip_dirs.setdefault(rel_dir, []).append(fname)
+
+    def _list_dir(self, rel_dir):
+        """Sorted file names directly inside a directory relative to the gunpack root (cached)."""
+        names = self._dir_listings.get(rel_dir)
+        if names is None:
+            if self._zip_dirs is not None:
+                names = sorted(self._zip_dirs.get(rel_dir, []))
+            else:
+                try:
+                    with os.scandir(os.path.join(self.gunpack_root_dir, *rel_dir.split("/"))) as it:
+                        names = sorted(entry.name for entry in it if entry.is_file())
+                except OSError:
+                    names = []
+            self._dir_listings[rel_dir] = names
+        return names
+
+    def _match_item_files(self, category, item_id, rel_dir, prefix):
+        """Yields (rule_index, rel_path) for the files in rel_dir starting with prefix that belong to item_id."""
+        names = self._list_dir(rel_dir)
+        for fname in itertools.islice(names, bisect.bisect_left(names, prefix), None):
+            if not fname.startswith(prefix):
+                break
+            rel_path = f"{rel_dir}/{fname}"
+            hit = self._matcher.match(rel_path)
+            if hit is None or self._matcher.rules[hit[0]].category != category:
+                continue
+            if self._matcher.resolve_id(hit[0], hit[1], self._index_ids[category]) == item_id:
+                yield hit[0], rel_path
+
+    def _resolve_item(self, category, item_id, index_dirs, shared_dirs, per_item_dirs):
+        # In shared directories every file of an item starts with its id (the
+        # listing is sorted, so they are found by bisection); per-item
+        # directories belong to the item entirely.
+        rel_dirs = [(d, item_id) for d in index_dirs + shared_dirs] + \
+                   [(template.replace("{id}", item_id), "") for template in per_item_dirs]
+        hits = sorted(hit for rel_dir, prefix in rel_dirs
+                      for hit in self._match_item_files(category, item_id, rel_dir, prefix))
+        assets = {key: [] for key in ASSET_KEYS}
+        for rule_index, rel_path in hits:
+            assets[self._matcher.rules[rule_index].asset_key].append(rel_path)
+        record = ItemRecord(item_id, self.path_table, assets)
+        if self._zip_ref:
+            for rel_path in record.rel_paths():
+                if not os.path.exists(os.path.join(self.gunpack_root_dir, *rel_path.split("/"))):
+                    self._zip_ref.extract(self._zip_prefix + rel_path, self.temp_dir_obj.name)
+        return record
+
+    def iter_items(self, categories=None, ids=None):
+        """Yields (category, item_id, item) as each item is resolved.
+
+        categories limits the walk to some of "guns", "ammo" and "attachments"
+        (in that order by default); ids limits it to the given item ids. On a
+        lazy parser only the directories those items need are listed, so the
+        first item arrives long before a full parse would finish and stopping
+        early skips the rest. Resolved items are kept in weapons_data,
+        ammo_data and attachment_data.
+        """
+        if not self._matcher: return
+        wanted = set(ids) if ids is not None else None
+        for category in categories or ITEM_CATEGORIES:
+            table = self.get_category_data(category)
+            if category in self._complete_categories:
+                for item_id in sorted(table):
+                    if wanted is None or item_id in wanted:
+                        yield category, item_id, table[item_id]
+                continue
+
+            index_dirs, shared_dirs, per_item_dirs = self._matcher.category_dirs(category)
+            if category not in self._index_ids:
+                declared = set()
+                for rel_dir in index_dirs:
+                    for fname in self._list_dir(rel_dir):
+                        hit = self._matcher.match(f"{rel_dir}/{fname}")
+                        if hit and self._matcher.rules[hit[0]].defines_item:
+                            declared.add(hit[1])
+                self._index_ids[category] = declared
+            for item_id in sorted(self._index_ids[category]):
+                if wanted is not None and item_id not in wanted:
+                    continue
+                if item_id not in table:
+                    table[item_id] = self._resolve_item(category, item_id, index_dirs, shared_dirs, per_item_dirs)
+                yield category, item_id, table[item_id]
+            if wanted is None:
+                self._complete_categories.add(category)
+
+    def list_files(self, rel_dir):
+        """Sorted file names in a "/"-separated directory relative to the gunpack root."""
+        return list(self._list_dir(rel_dir)) if self.gunpack_root_dir else []
+
+    def read_bytes(self, rel_path):
+        """Contents of a file relative to the gunpack root; read from the zip when not extracted."""
+        if self._zip_ref:
+            full_path = os.path.join(self.gunpack_root_dir, *rel_path.split("/"))
+            if not os.path.isfile(full_path):
+                return self._zip_ref.read(self._zip_prefix + rel_path)
+        with open(os.path.join(self.gunpack_root_dir, *rel_path.split("/")), 'rb') as f:
+            return f.read()
 
     def get_weapons_data(self):
+        if "guns" not in self._complete_categories:
+            for _ in self.iter_items(("guns",)): pass
         return self.weapons_data
 
     def cleanup(self):
+        if self._zip_ref:
+            self._zip_ref.close()
+            self._zip_ref = None
         if self.temp_dir_obj:
             try:
                 self.temp_dir_obj.cleanup()
@@ -197,7 +316,7 @@ if __name__ == "__main__":
         print(f"Detected Namespace: {parser.namespace}")
         print(f"Gunpack Root: {parser.gunpack_root_dir}")
         print(f"Is from ZIP: {parser.is_loaded_from_zip}")
-        print(f"Weapons Data: {json.dumps(parser.get_weapons_data(), indent=2)}")
+        print(f"Weapons Data: {json.dumps({k: v.to_dict() for k, v in parser.get_weapons_data().items()}, indent=2)}")
 
         # Test incremental add to this loaded pack (folder)
         if parser and parser.gunpack_root_dir and parser.namespace:
@@ -229,7 +348,7 @@ if __name__ == "__main__":
         print(f"Detected Namespace (zip): {parser_zip.namespace}")
         print(f"Gunpack Root (zip, temp): {parser_zip.gunpack_root_dir}")
         print(f"Is from ZIP (zip): {parser_zip.is_loaded_from_zip}")
-        print(f"Weapons Data (zip): {json.dumps(parser_zip.get_weapons_data(), indent=2)}")
+        print(f"Weapons Data (zip): {json.dumps({k: v.to_dict() for k, v in parser_zip.get_weapons_data().items()}, indent=2)}")
 
         # Test incremental add to this loaded pack (from ZIP, so to temp dir)
         if parser_zip and parser_zip.gunpack_root_dir and parser_zip.namespace:
@@ -249,6 +368,18 @@ if __name__ == "__main__":
     finally:
         if parser_zip: parser_zip.cleanup() # This will delete the temp dir
     
+    print(f"\n--- Testing lazy iteration with ZIP: {zip_path} ---")
+    parser_lazy = None
+    try:
+        parser_lazy = GunpackParser(zip_path, lazy=True)
+        for category, item_id, item in parser_lazy.iter_items(categories=("guns",), ids=["test_gun"]):
+            print(f"{category}/{item_id}: {json.dumps(item.to_dict(), indent=2)}")
+        print(f"Items resolved so far: {sorted(parser_lazy.weapons_data)}")
+    except Exception as e:
+        print(f"Error during lazy zip test: {e}")
+    finally:
+        if parser_lazy: parser_lazy.cleanup()
+
     if os.path.exists(test_pack_dir): shutil.rmtree(test_pack_dir)
     if os.path.exists(zip_path): os.remove(zip_path)
     print("\nParser tests complete.")
@@ -0,0 +1,245 @@
+import os
+import json
+import zlib
+import struct
+import hashlib
+import zipfile
+import tempfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from gunpack_asset_rules import asset_type, detect_root
+
+# Builds a distribution copy of a gunpack: JSON minified (optionally with
+# floats rounded in geo/animation files) and PNGs re-deflated losslessly with
+# ancillary chunks stripped. Files are processed in a process pool; a cache
+# keyed by source content hash and build options lets rebuilds skip files that
+# did not change.
+
+CACHE_FILE_NAME = ".release_cache.json"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Ancillary chunks that still change how the image looks (transparency, APNG frames) are kept.
+PNG_KEPT_ANCILLARY = {b"tRNS", b"acTL", b"fcTL", b"fdAT"}
+PNG_ZLIB_STRATEGIES = (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED)
+
+
+def _round_floats(value, digits):
+    if isinstance(value, float):
+        rounded = round(value, digits)
+        return int(rounded) if rounded.is_integer() else rounded
+    if isinstance(value, dict):
+        return {k: _round_floats(v, digits) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_round_floats(v, digits) for v in value]
+    return value
+
+
+def _is_geo_or_animation(rel_path):
+    return "/geo_models/" in rel_path or "/animations/" in rel_path or \
+        rel_path.endswith(".geo.json") or rel_path.endswith(".animation.json")
+
+
+def minify_json(data, rel_path, float_digits=None):
+    """Re-serializes JSON without whitespace; geo/animation floats are rounded when float_digits is set."""
+    content = json.loads(data.decode("utf-8-sig"))
+    if float_digits is not None and _is_geo_or_animation(rel_path):
+        content = _round_floats(content, float_digits)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _png_chunk(chunk_type, payload):
+    return struct.pack(">I", len(payload)) + chunk_type + payload + \
+        struct.pack(">I", zlib.crc32(chunk_type + payload) & 0xffffffff)
+
+
+def recompress_png(data, level=9):
+    """Re-deflates the IDAT stream and drops ancillary chunks; pixel data is untouched."""
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("Not a PNG file.")
+    pos = len(PNG_SIGNATURE)
+    before_idat, after_idat, idat = [], [], []
+    while pos < len(data):
+        length, chunk_type = struct.unpack(">I4s", data[pos:pos + 8])
+        payload = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if chunk_type == b"IDAT":
+            idat.append(payload)
+        elif chunk_type[0] & 0x20 and chunk_type not in PNG_KEPT_ANCILLARY:
+            continue # Lowercase first letter: ancillary (text, time, physical size, ...)
+        elif not idat:
+            before_idat.append((chunk_type, payload))
+        else:
+            after_idat.append((chunk_type, payload))
+        if chunk_type == b"IEND":
+            break
+    raw = zlib.decompress(b"".join(idat))
+
+    best = None
+    for strategy in PNG_ZLIB_STRATEGIES:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 15, 9, strategy)
+        candidate = compressor.compress(raw) + compressor.flush()
+        if best is None or len(candidate) < len(best):
+            best = candidate
+
+    out = [PNG_SIGNATURE]
+    out.extend(_png_chunk(t, p) for t, p in before_idat)
+    out.append(_png_chunk(b"IDAT", best))
+    out.extend(_png_chunk(t, p) for t, p in after_idat)
+    return b"".join(out)
+
+
+def _process_file(src_path, dst_path, rel_path, options):
+    """Worker: writes the optimized file and returns (rel_path, src_size, dst_size, error)."""
+    with open(src_path, "rb") as f:
+        data = f.read()
+    out, error = data, None
+    try:
+        if rel_path.endswith(".json") and options["minify_json"]:
+            out = minify_json(data, rel_path, options["float_digits"])
+        elif rel_path.endswith(".png") and options["optimize_png"]:
+            out = recompress_png(data, options["png_level"])
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        out = data
+    if len(out) > len(data):
+        out = data
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    with open(dst_path, "wb") as f:
+        f.write(out)
+    return rel_path, len(data), len(out), error
+
+
+def _file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_release(pack_path, output_dir, minify_json=True, float_digits=None, optimize_png=True,
+                  png_level=9, workers=None, zip_output=None):
+    """Writes an optimized copy of pack_path (folder or .zip) to output_dir.
+
+    Returns a report {"by_type": {asset_type: {...}}, "totals": {...}, "errors": [...]}.
+    """
+    temp_dir_obj = None
+    if os.path.isfile(pack_path) and pack_path.endswith(".zip"):
+        temp_dir_obj = tempfile.TemporaryDirectory(prefix="tacz_release_")
+        with zipfile.ZipFile(pack_path, "r") as zip_ref:
+            zip_ref.extractall(temp_dir_obj.name)
+        source_dir = temp_dir_obj.name
+    elif os.path.isdir(pack_path):
+        source_dir = pack_path
+    else:
+        raise Exception(f"Invalid pack path: {pack_path}. Must be a directory or .zip file.")
+
+    options = {"minify_json": minify_json, "float_digits": float_digits,
+               "optimize_png": optimize_png, "png_level": png_level}
+    options_key = json.dumps(options, sort_keys=True)
+    os.makedirs(output_dir, exist_ok=True)
+    cache_path = os.path.join(output_dir, CACHE_FILE_NAME)
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    report = {"by_type": {}, "totals": {"files": 0, "cached": 0, "source_bytes": 0, "output_bytes": 0},
+              "errors": []}
+
+    def _record(rel_path, src_size, dst_size, cached=False):
+        bucket = report["by_type"].setdefault(asset_type(rel_path, prefix),
+                                              {"files": 0, "source_bytes": 0, "output_bytes": 0, "saved_bytes": 0})
+        for stats in (bucket, report["totals"]):
+            stats["files"] += 1
+            stats["source_bytes"] += src_size
+            stats["output_bytes"] += dst_size
+        bucket["saved_bytes"] += src_size - dst_size
+        if cached: report["totals"]["cached"] += 1
+
+    try:
+        sources = {}
+        output_abs = os.path.abspath(output_dir)
+        for root, dirs, files in os.walk(source_dir):
+            dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) != output_abs]
+            for fname in files:
+                src_path = os.path.join(root, fname)
+                rel_path = os.path.relpath(src_path, source_dir).replace(os.sep, "/")
+                if rel_path != CACHE_FILE_NAME: sources[rel_path] = src_path
+        # Zips often wrap the pack in a top-level folder; bucket relative to the gunpack root.
+        prefix = (detect_root(sources) or ("", None))[0]
+
+        pending, seen = [], set(sources)
+        for rel_path, src_path in sources.items():
+            dst_path = os.path.join(output_dir, *rel_path.split("/"))
+            content_hash = _file_hash(src_path)
+            entry = cache.get(rel_path)
+            if entry and entry["hash"] == content_hash and entry["options"] == options_key and \
+                    os.path.isfile(dst_path) and os.path.getsize(dst_path) == entry["output_bytes"]:
+                _record(rel_path, entry["source_bytes"], entry["output_bytes"], cached=True)
+                continue
+            pending.append((src_path, dst_path, rel_path, content_hash))
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(pool.submit(_process_file, src, dst, rel, options), h) for src, dst, rel, h in pending]
+            for future, content_hash in futures:
+                rel_path, src_size, dst_size, error = future.result()
+                _record(rel_path, src_size, dst_size)
+                if error:
+                    report["errors"].append(f"{rel_path}: {error}")
+                    print(f"Warning: Copied {rel_path} unoptimized: {error}")
+                cache[rel_path] = {"hash": content_hash, "options": options_key,
+                                   "source_bytes": src_size, "output_bytes": dst_size}
+
+        # Files removed from the source disappear from the distribution too.
+        for rel_path in set(cache) - seen:
+            stale_path = os.path.join(output_dir, *rel_path.split("/"))
+            if os.path.isfile(stale_path): os.remove(stale_path)
+            del cache[rel_path]
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    finally:
+        if temp_dir_obj: temp_dir_obj.cleanup()
+
+    if zip_output:
+        with zipfile.ZipFile(zip_output, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as zip_ref:
+            for rel_path in sorted(seen):
+                zip_ref.write(os.path.join(output_dir, *rel_path.split("/")), rel_path)
+    return report
+
+
+def format_report(report):
+    lines = [f"{'Asset type':<20}{'Files':>8}{'Source':>14}{'Output':>14}{'Saved':>14}{'%':>7}"]
+    for name, stats in sorted(report["by_type"].items(), key=lambda kv: -kv[1]["saved_bytes"]):
+        pct = 100.0 * stats["saved_bytes"] / stats["source_bytes"] if stats["source_bytes"] else 0.0
+        lines.append(f"{name:<20}{stats['files']:>8}{stats['source_bytes']:>14}{stats['output_bytes']:>14}"
+                     f"{stats['saved_bytes']:>14}{pct:>6.1f}%")
+    totals = report["totals"]
+    saved = totals["source_bytes"] - totals["output_bytes"]
+    lines.append(f"Total: {totals['files']} files ({totals['cached']} unchanged since last build), "
+                 f"{totals['source_bytes']} -> {totals['output_bytes']} bytes, saved {saved}.")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Build a size-optimized distribution copy of a TACZ gunpack.")
+    arg_parser.add_argument("pack", help="Gunpack folder or .zip")
+    arg_parser.add_argument("output_dir", help="Distribution folder (reused as the rebuild cache).")
+    arg_parser.add_argument("--zip", dest="zip_output", help="Also write the distribution as this .zip.")
+    arg_parser.add_argument("--round-floats", type=int, metavar="DIGITS",
+                            help="Round floats in geo model and animation JSON to DIGITS decimals.")
+    arg_parser.add_argument("--no-json", action="store_true", help="Copy JSON unchanged.")
+    arg_parser.add_argument("--no-png", action="store_true", help="Copy PNGs unchanged.")
+    arg_parser.add_argument("--png-level", type=int, default=9, choices=range(1, 10))
+    arg_parser.add_argument("--workers", type=int, help="Process pool size (default: CPU count).")
+    args = arg_parser.parse_args()
+
+    if os.path.abspath(args.output_dir) == os.path.abspath(args.pack):
+        arg_parser.error("output_dir must differ from the source pack.")
+    result = build_release(args.pack, args.output_dir, minify_json=not args.no_json, float_digits=args.round_floats,
+                           optimize_png=not args.no_png, png_level=args.png_level, workers=args.workers,
+                           zip_output=args.zip_output)
+    print(format_report(result))
+    for err in result["errors"]:
+        print(f"Error: {err}")
@@ -0,0 +1,175 @@
+import os
+import bisect
+from concurrent.futures import ThreadPoolExecutor
+
+from gunpack_parser import GunpackParser
+
+# Several gunpacks installed side by side, merged the way the game resolves
+# them. TACZ reads the packs in the tacz folder in file name order and
+# registers them one after another, so when two packs define the same
+# "namespace:id" (or ship a file at the same path) the pack loaded last wins.
+# A pack can be given an explicit priority to model a different order; higher
+# priority loads later and therefore wins.
+#
+# The merged view is a pair of hash indexes -- item key -> providers and
+# asset path -> providers, each kept sorted by load order -- so adding or
+# removing one pack only touches the keys that pack provides.
+
+
+class WorkspacePack:
+    def __init__(self, pack_path, parser, priority=0):
+        self.pack_path = pack_path
+        self.parser = parser
+        self.priority = priority
+        self.name = os.path.basename(os.path.normpath(pack_path))
+        self.item_keys = []   # (category, "namespace:id") provided by this pack
+        self.asset_paths = [] # relative asset paths provided by this pack
+
+    @property
+    def load_order(self):
+        return (self.priority, self.name.lower(), self.pack_path)
+
+
+class GunpackWorkspace:
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+        self.packs = {}          # pack_path -> WorkspacePack
+        self._item_index = {}    # (category, key) -> [WorkspacePack, ...] in load order
+        self._asset_index = {}   # rel_path -> [WorkspacePack, ...] in load order
+
+    # --- Loading --- #
+    def add_packs(self, pack_paths, priorities=None):
+        """Parses packs in parallel, then merges each one. Returns {pack_path: error} for failures."""
+        priorities = {os.path.abspath(p): priority for p, priority in (priorities or {}).items()}
+        paths = [p for p in dict.fromkeys(os.path.abspath(p) for p in pack_paths) if p not in self.packs]
+        errors = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {p: pool.submit(GunpackParser, p) for p in paths}
+            for pack_path, future in futures.items():
+                try:
+                    self._merge(WorkspacePack(pack_path, future.result(), priorities.get(pack_path, 0)))
+                except Exception as e:
+                    errors[pack_path] = str(e)
+        return errors
+
+    def add_pack(self, pack_path, priority=0):
+        pack_path = os.path.abspath(pack_path)
+        if pack_path in self.packs:
+            self.remove_pack(pack_path)
+        self._merge(WorkspacePack(pack_path, GunpackParser(pack_path), priority))
+        return self.packs[pack_path]
+
+    def remove_pack(self, pack_path):
+        pack = self.packs.pop(os.path.abspath(pack_path), None)
+        if pack is None:
+            return False
+        for index, keys in ((self._item_index, pack.item_keys), (self._asset_index, pack.asset_paths)):
+            for key in keys:
+                providers = [p for p in index[key] if p is not pack]
+                if providers: index[key] = providers
+                else: del index[key]
+        pack.parser.cleanup()
+        return True
+
+    def _merge(self, pack):
+        if not pack.parser.namespace:
+            pack.parser.cleanup()
+            raise Exception(f"Could not determine namespace for {pack.pack_path}.")
+        self.packs[pack.pack_path] = pack
+        assets = set()
+        for category, item_id, item in pack.parser.iter_items():
+            pack.item_keys.append((category, f"{pack.parser.namespace}:{item_id}"))
+            assets.update(item.rel_paths())
+        pack.asset_paths = sorted(assets)
+        for index, keys in ((self._item_index, pack.item_keys), (self._asset_index, pack.asset_paths)):
+            for key in keys:
+                providers = index.setdefault(key, [])
+                orders = [p.load_order for p in providers]
+                providers.insert(bisect.bisect(orders, pack.load_order), pack)
+
+    def cleanup(self):
+        for pack in self.packs.values():
+            pack.parser.cleanup()
+        self.packs.clear()
+        self._item_index.clear()
+        self._asset_index.clear()
+
+    # --- Merged view --- #
+    def load_order(self):
+        return sorted(self.packs.values(), key=lambda p: p.load_order)
+
+    def item_keys(self, category="guns"):
+        return sorted(key for cat, key in self._item_index if cat == category)
+
+    def winner(self, category, key):
+        providers = self._item_index.get((category, key))
+        return providers[-1] if providers else None
+
+    def get_item(self, category, key):
+        """The item definition the game would use for "namespace:id", or None."""
+        pack = self.winner(category, key)
+        if pack is None:
+            return None
+        return pack.parser.get_category_data(category)[key.split(":", 1)[1]]
+
+    def asset_winner(self, rel_path):
+        providers = self._asset_index.get(rel_path)
+        return providers[-1] if providers else None
+
+    def resolve(self, category, key):
+        """Winner, overridden providers and shadowed assets for one item key.
+
+        An asset is shadowed when a pack later in the load order ships a file
+        at the same path, whether or not that pack defines the item.
+        """
+        providers = self._item_index.get((category, key))
+        if not providers:
+            return None
+        item_id = key.split(":", 1)[1]
+        shadowed = []
+        for pack in providers:
+            for rel_path in pack.parser.get_category_data(category)[item_id].rel_paths():
+                top = self._asset_index[rel_path][-1]
+                if top is not pack:
+                    shadowed.append((pack.pack_path, rel_path, top.pack_path))
+        return {
+            "key": key,
+            "winner": providers[-1].pack_path,
+            "overridden": [p.pack_path for p in providers[:-1]],
+            "shadowed_assets": shadowed,
+        }
+
+    def conflicts(self, category=None):
+        """Item keys defined by more than one pack."""
+        return sorted((cat, key) for (cat, key), providers in self._item_index.items()
+                      if len(providers) > 1 and category in (None, cat))
+
+
+if __name__ == "__main__":
+    import json
+    import shutil
+    import tempfile
+    from gunpack_generator import create_tacz_gunpack_structure, add_new_weapon_files
+
+    base_dir = tempfile.mkdtemp(prefix="tacz_workspace_test_")
+    try:
+        pack_a = create_tacz_gunpack_structure(base_dir, "a_base_pack", "shared")
+        pack_b = create_tacz_gunpack_structure(base_dir, "b_override_pack", "shared")
+        for gun_id in ("ak47", "m4a1"): add_new_weapon_files(pack_a, "shared", gun_id)
+        add_new_weapon_files(pack_b, "shared", "ak47")
+        add_new_weapon_files(pack_b, "shared", "awp")
+
+        workspace = GunpackWorkspace()
+        print(f"Load errors: {workspace.add_packs([pack_b, pack_a])}")
+        print(f"Load order: {[p.name for p in workspace.load_order()]}")
+        for key in workspace.item_keys("guns"):
+            print(f"{key}: winner {workspace.winner('guns', key).name}")
+        print(f"Conflicts: {workspace.conflicts()}")
+        print(json.dumps(workspace.resolve("guns", "shared:ak47"), indent=2))
+
+        workspace.remove_pack(pack_b)
+        print(f"After removing b: ak47 winner {workspace.winner('guns', 'shared:ak47').name}, "
+              f"guns {workspace.item_keys('guns')}")
+        workspace.cleanup()
+    finally:
+        shutil.rmtree(base_dir)
@@ -5,6 +5,9 @@ import json
 import shutil # For cleaning up test directories
 
 from gunpack_parser import GunpackParser # For opening files externally
+from gunpack_workspace import GunpackWorkspace
+from gunpack_footprint import compute_footprint, format_size
+from gunpack_lang import LangTable, display_names
 from gunpack_generator import (
     create_tacz_gunpack_structure,
     add_new_weapon_files,
@@ -34,7 +37,10 @@ class TaczGunpackToolApp:
         self.root.geometry("900x700")
 
         self.parser = None
+        self.viewer_footprint = None
+        self.viewer_weapon_ids = [] # Listbox rows show display names; this maps rows back to ids
         self.gunpack_path_var = tk.StringVar()
+        self.workspace = GunpackWorkspace()
         
         # Variables for the creator tab
         self.creator_project_name_var = tk.StringVar()
@@ -56,6 +62,11 @@ class TaczGunpackToolApp:
         self.creator_tab = ttk.Frame(self.notebook, padding="5")
         self.notebook.add(self.creator_tab, text="Create New Gunpack")
         self.setup_creator_tab()
+
+        # --- Workspace Tab --- 
+        self.workspace_tab = ttk.Frame(self.notebook, padding="5")
+        self.notebook.add(self.workspace_tab, text="Multi-Pack Workspace")
+        self.setup_workspace_tab()
         
         # Status Bar (shared or individual? For now, one main status bar)
         self.status_var = tk.StringVar()
@@ -87,10 +98,13 @@ class TaczGunpackToolApp:
         
         assets_frame = ttk.Labelframe(main_paned_window, text="Weapon Assets (Viewer)", padding="5")
         main_paned_window.add(assets_frame, weight=3)
-        self.assets_tree_viewer = ttk.Treeview(assets_frame, columns=("path",), show="tree headings")
+        # "path" stays the first column: on_asset_double_click reads values[0].
+        self.assets_tree_viewer = ttk.Treeview(assets_frame, columns=("path", "size"), show="tree headings")
         self.assets_tree_viewer.heading("#0", text="Asset Type / File")
         self.assets_tree_viewer.heading("path", text="Full Path")
+        self.assets_tree_viewer.heading("size", text="Size (compressed)")
         self.assets_tree_viewer.column("path", width=300, stretch=tk.YES)
+        self.assets_tree_viewer.column("size", width=140, stretch=tk.NO, anchor=tk.E)
         self.assets_tree_viewer.pack(expand=True, fill=tk.BOTH)
         self.assets_tree_viewer.bind("<Double-1>", lambda e: self.on_asset_double_click(self.assets_tree_viewer))
 
@@ -124,8 +138,22 @@ class TaczGunpackToolApp:
             self.status_var.set("Viewer: Failed to determine namespace.")
             if self.parser: self.parser.cleanup(); self.parser = None
             return
+        try:
+            self.viewer_footprint = compute_footprint(pack_path)
+        except Exception as e:
+            self.viewer_footprint = None
+            print(f"Note: Could not compute size footprint for {pack_path}: {e}")
+        try:
+            lang = LangTable()
+            lang.load_pack(self.parser)
+            names = display_names(self.parser, lang)
+        except Exception as e:
+            names = {}
+            print(f"Note: Could not load translations for {pack_path}: {e}")
+        self.viewer_weapon_ids = sorted(weapons_data.keys())
         if weapons_data:
-            for weapon_id in sorted(weapons_data.keys()): self.weapons_listbox.insert(tk.END, weapon_id)
+            for weapon_id in self.viewer_weapon_ids:
+                self.weapons_listbox.insert(tk.END, f"{weapon_id}  -  {names[weapon_id]}" if weapon_id in names else weapon_id)
             self.status_var.set(f"Viewer: Loaded {len(weapons_data)} weapons from 	'{self.parser.namespace}	'.")
         else:
             self.status_var.set("Viewer: No weapons found or error parsing.")
@@ -134,19 +162,38 @@ class TaczGunpackToolApp:
     def on_weapon_select_viewer(self, event):
         selection = event.widget.curselection()
         if not selection: return
-        weapon_id = event.widget.get(selection[0])
+        weapon_id = self.viewer_weapon_ids[selection[0]]
         self.status_var.set(f"Viewer: Displaying assets for: {weapon_id}")
         self.assets_tree_viewer.delete(*self.assets_tree_viewer.get_children())
         if self.parser and weapon_id in self.parser.weapons_data:
             assets = self.parser.weapons_data[weapon_id].get("assets", {})
             for asset_key, asset_paths in sorted(assets.items()):
-                cat_node = self.assets_tree_viewer.insert("", tk.END, text=asset_key.replace("_", " ").title(), open=True, values=("N/A",))
-                if isinstance(asset_paths, list):
-                    for p in asset_paths: self.assets_tree_viewer.insert(cat_node, tk.END, text=os.path.basename(p), values=(p,))
-                elif isinstance(asset_paths, str):
-                    self.assets_tree_viewer.insert(cat_node, tk.END, text=os.path.basename(asset_paths), values=(asset_paths,))
+                if isinstance(asset_paths, str): asset_paths = [asset_paths]
+                sizes = [self._viewer_file_size(p) for p in asset_paths]
+                known = [s for s in sizes if s]
+                total = (sum(s[0] for s in known), sum(s[1] for s in known)) if known else None
+                cat_node = self.assets_tree_viewer.insert("", tk.END, text=asset_key.replace("_", " ").title(), open=True,
+                                                          values=("N/A", self._format_size_pair(total)))
+                for p, size in zip(asset_paths, sizes):
+                    self.assets_tree_viewer.insert(cat_node, tk.END, text=os.path.basename(p), values=(p, self._format_size_pair(size)))
+            entry = self.viewer_footprint["items"]["guns"].get(weapon_id) if self.viewer_footprint else None
+            if entry:
+                self.status_var.set(f"Viewer: {weapon_id}: {entry['files']} files, {self._format_size_pair((entry['size'], entry['compressed']))}")
         else: self.status_var.set(f"Viewer: No asset data for {weapon_id}")
 
+    def _viewer_file_size(self, file_path):
+        """(size, compressed) for a parsed asset path from the pack's footprint, or None."""
+        if not self.viewer_footprint or not self.parser or not self.parser.gunpack_root_dir: return None
+        rel_path = os.path.relpath(file_path, self.parser.gunpack_root_dir).replace(os.sep, "/")
+        return self.viewer_footprint["files"].get(rel_path)
+
+    def _format_size_pair(self, sizes):
+        if not sizes: return ""
+        size, compressed = sizes
+        if self.viewer_footprint and self.viewer_footprint["from_zip"]:
+            return f"{format_size(size)} ({format_size(compressed)})"
+        return format_size(size)
+
     # --- CREATOR TAB SETUP AND LOGIC --- #
     def setup_creator_tab(self):
         # Initialization Frame
@@ -343,6 +390,99 @@ class TaczGunpackToolApp:
         else:
             messagebox.showerror("Error", f"gunpack_info.json not found at {file_path}. Try creating structure again.")
 
+    # --- WORKSPACE TAB SETUP AND LOGIC --- #
+    def setup_workspace_tab(self):
+        main_paned_window = ttk.PanedWindow(self.workspace_tab, orient=tk.HORIZONTAL)
+        main_paned_window.pack(expand=True, fill=tk.BOTH, padx=5, pady=5)
+
+        packs_frame = ttk.Labelframe(main_paned_window, text="Packs (load order, last wins)", padding="5")
+        main_paned_window.add(packs_frame, weight=1)
+        self.workspace_packs_listbox = tk.Listbox(packs_frame, exportselection=False)
+        self.workspace_packs_listbox.pack(expand=True, fill=tk.BOTH)
+        ttk.Button(packs_frame, text="Add Folder...", command=self.add_workspace_folder).pack(fill=tk.X, pady=(3,0))
+        ttk.Button(packs_frame, text="Add ZIP(s)...", command=self.add_workspace_zips).pack(fill=tk.X, pady=(3,0))
+        ttk.Button(packs_frame, text="Remove Selected", command=self.remove_workspace_pack).pack(fill=tk.X, pady=(3,0))
+
+        weapons_frame = ttk.Labelframe(main_paned_window, text="Merged Weapons", padding="5")
+        main_paned_window.add(weapons_frame, weight=1)
+        self.workspace_weapons_listbox = tk.Listbox(weapons_frame, exportselection=False)
+        self.workspace_weapons_listbox.pack(expand=True, fill=tk.BOTH)
+        self.workspace_weapons_listbox.bind("<<ListboxSelect>>", self.on_workspace_weapon_select)
+        self.workspace_weapon_keys = []
+
+        assets_frame = ttk.Labelframe(main_paned_window, text="Resolution", padding="5")
+        main_paned_window.add(assets_frame, weight=3)
+        self.assets_tree_workspace = ttk.Treeview(assets_frame, columns=("path",), show="tree headings")
+        self.assets_tree_workspace.heading("#0", text="Pack / Asset")
+        self.assets_tree_workspace.heading("path", text="Full Path")
+        self.assets_tree_workspace.column("path", width=300, stretch=tk.YES)
+        self.assets_tree_workspace.pack(expand=True, fill=tk.BOTH)
+        self.assets_tree_workspace.bind("<Double-1>", lambda e: self.on_asset_double_click(self.assets_tree_workspace))
+
+    def add_workspace_folder(self):
+        path = filedialog.askdirectory(title="Select Gunpack Folder")
+        if path: self._add_workspace_packs([path])
+
+    def add_workspace_zips(self):
+        paths = filedialog.askopenfilenames(title="Select Gunpack ZIP Files", filetypes=(("ZIP files", "*.zip"), ("All files", "*.*")))
+        if paths: self._add_workspace_packs(list(paths))
+
+    def _add_workspace_packs(self, paths):
+        self.status_var.set(f"Workspace: Loading {len(paths)} pack(s)...") ; self.root.update_idletasks()
+        errors = self.workspace.add_packs(paths)
+        for pack_path, error in errors.items():
+            messagebox.showerror("Load Error", f"Workspace: Failed to load {pack_path}: {error}")
+        self.refresh_workspace_view()
+        self.status_var.set(f"Workspace: {len(self.workspace.packs)} pack(s), {len(self.workspace_weapon_keys)} weapons, "
+                            f"{len(self.workspace.conflicts('guns'))} overridden.")
+
+    def remove_workspace_pack(self):
+        selection = self.workspace_packs_listbox.curselection()
+        if not selection: return
+        pack = self.workspace.load_order()[selection[0]]
+        self.workspace.remove_pack(pack.pack_path)
+        self.refresh_workspace_view()
+        self.status_var.set(f"Workspace: Removed {pack.name}.")
+
+    def refresh_workspace_view(self):
+        self.workspace_packs_listbox.delete(0, tk.END)
+        for pack in self.workspace.load_order():
+            self.workspace_packs_listbox.insert(tk.END, f"{pack.name}  [{pack.parser.namespace}]")
+        self.workspace_weapons_listbox.delete(0, tk.END)
+        self.assets_tree_workspace.delete(*self.assets_tree_workspace.get_children())
+        self.workspace_weapon_keys = self.workspace.item_keys("guns")
+        conflicts = set(key for _, key in self.workspace.conflicts("guns"))
+        for key in self.workspace_weapon_keys:
+            winner = self.workspace.winner("guns", key)
+            marker = " *" if key in conflicts else ""
+            self.workspace_weapons_listbox.insert(tk.END, f"{key}  ({winner.name}){marker}")
+
+    def on_workspace_weapon_select(self, event):
+        selection = event.widget.curselection()
+        if not selection: return
+        key = self.workspace_weapon_keys[selection[0]]
+        tree = self.assets_tree_workspace
+        tree.delete(*tree.get_children())
+        resolution = self.workspace.resolve("guns", key)
+        if not resolution: return
+        winner = self.workspace.winner("guns", key)
+        win_node = tree.insert("", tk.END, text=f"Winner: {winner.name}", open=True, values=("N/A",))
+        for asset_key, asset_paths in self.workspace.get_item("guns", key)["assets"].items():
+            if not asset_paths: continue
+            cat_node = tree.insert(win_node, tk.END, text=asset_key.replace("_", " ").title(), open=True, values=("N/A",))
+            for p in asset_paths: tree.insert(cat_node, tk.END, text=os.path.basename(p), values=(p,))
+        if resolution["overridden"]:
+            over_node = tree.insert("", tk.END, text="Overridden Definitions", open=True, values=("N/A",))
+            for pack_path in resolution["overridden"]:
+                tree.insert(over_node, tk.END, text=os.path.basename(pack_path), values=("N/A",))
+        if resolution["shadowed_assets"]:
+            shadow_node = tree.insert("", tk.END, text="Shadowed Assets", open=True, values=("N/A",))
+            for pack_path, rel_path, by_pack in resolution["shadowed_assets"]:
+                full_path = os.path.join(self.workspace.packs[pack_path].parser.gunpack_root_dir, *rel_path.split("/"))
+                tree.insert(shadow_node, tk.END, text=f"{rel_path}  ({os.path.basename(pack_path)} -> {os.path.basename(by_pack)})",
+                            values=(full_path,))
+        self.status_var.set(f"Workspace: {key} resolved from {winner.name}")
+
     # --- COMMON UTILITY METHODS --- #
     def on_asset_double_click(self, tree_widget):
         item_id = tree_widget.focus()
@@ -366,6 +506,7 @@ class TaczGunpackToolApp:
     def on_closing(self):
         if self.parser:
             self.parser.cleanup()
+        self.workspace.cleanup()
         # Clean up test directories if they exist from gunpack_generator.py's __main__
         test_gen_output_dir = "/home/ubuntu/tacz_gui_project/test_generator_output"
         if os.path.exists(test_gen_output_dir):